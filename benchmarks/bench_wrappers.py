@@ -0,0 +1,262 @@
+"""
+Benchmark read throughput of the wrappers module.
+
+Run against the data files in the tests directory, reporting time per
+call, samples (or records) per second and MB per second for each
+benchmark. Results are written to a JSON file in the results
+directory, give an earlier results file with --compare to see the
+change.
+
+    $ python bench_wrappers.py
+    $ python bench_wrappers.py --compare results/20260101-120000.json
+
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import platform
+import argparse
+import ctypes as ct
+import subprocess
+
+# Benchmarking the local package
+here = os.path.dirname(os.path.abspath(__file__))
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+import dwdat2py
+from dwdat2py import wrappers
+from dwdat2py import DWDataReaderHeader as dh
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TESTDIR = os.path.join(packdir, 'tests')
+DATAFILE1 = os.path.join(TESTDIR, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(TESTDIR, 'Test2.dxd')
+RESULTSDIR = os.path.join(here, 'results')
+
+CHUNK_SIZES = (256, 4096, 65536)
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+def scaled_samples(index, chunk, as_array):
+    """Read all samples of channel index in chunks of chunk samples."""
+    array_size = wrappers.channel_catalog().by_index[index].array_size
+    count = wrappers.get_scaled_samples_count(index)
+
+    def run():
+        for position in range(0, count, chunk):
+            n = min(chunk, count - position)
+            wrappers.get_scaled_samples(index, position, n, array_size,
+                                        as_array)
+        return count, count * 8 * (array_size + 1)
+    return run
+
+
+def reduced_values(index, as_array):
+    count, _ = wrappers.get_reduced_values_count(index)
+
+    def run():
+        wrappers.get_reduced_values(index, 0, count, as_array)
+        return count, count * 40
+    return run
+
+
+def channel_reduced(channel):
+    index = wrappers.channel_index(channel)
+    count, _ = wrappers.get_reduced_values_count(index)
+
+    def run():
+        wrappers.channel_reduced(channel, 1)
+        return count, count * 8
+    return run
+
+
+def channel_list():
+    count = wrappers.get_channel_list_count()
+
+    def run():
+        wrappers.get_channel_list()
+        return count, count * ct.sizeof(dh.DWChannel)
+    return run
+
+
+def channel_props_xml():
+    indexes = [ch.index for ch in wrappers.get_channel_list()]
+
+    def run():
+        size = 0
+        for index in indexes:
+            size += len(wrappers.get_channel_props(
+                index, dh.DWChannelProps.DW_CH_XML.value))
+        return len(indexes), size
+    return run
+
+
+def benchmarks(datafile):
+    """Yield (name, params, run) for the benchmarks of datafile.
+
+    run is a function doing the benchmarked work once and returning
+    (items, bytes) processed. Called with datafile opened.
+
+    """
+
+    catalog = wrappers.channel_catalog()
+    samples = [ch for ch in catalog.channels
+               if wrappers.get_scaled_samples_count(ch.index) > 0]
+    longest = max(samples, key=lambda ch: (
+        wrappers.get_scaled_samples_count(ch.index), ch.array_size))
+    modes = (False, True) if np is not None else (False,)
+
+    for chunk in CHUNK_SIZES:
+        for as_array in modes:
+            yield ('get_scaled_samples',
+                   {'channel': longest.name, 'chunk': chunk,
+                    'as_array': as_array},
+                   scaled_samples(longest.index, chunk, as_array))
+
+    reduced = max(catalog.channels, key=lambda ch: (
+        wrappers.get_reduced_values_count(ch.index)[0]))
+    for as_array in modes:
+        yield ('get_reduced_values',
+               {'channel': reduced.name, 'as_array': as_array},
+               reduced_values(reduced.index, as_array))
+    yield ('channel_reduced', {'by': 'index'},
+           channel_reduced(reduced.index))
+    yield ('channel_reduced', {'by': 'name'},
+           channel_reduced(reduced.name))
+    yield 'get_channel_list', {}, channel_list()
+    yield 'get_channel_props', {'prop': 'DW_CH_XML'}, channel_props_xml()
+
+
+def measure(run, min_time):
+    """Return (seconds per call, items, bytes) for run.
+
+    run is called in rounds of a number of calls large enough to take
+    at least min_time / 5, the best of five rounds is used.
+
+    """
+    items, size = run()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 5:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(4):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, time.perf_counter() - start)
+    return best / number, items, size
+
+
+def run_all(min_time):
+    """Run all benchmarks, return a list of result dicts."""
+    results = []
+    wrappers.init()
+    try:
+        for datafile in (DATAFILE1, DATAFILE2):
+            wrappers.open_data_file(datafile)
+            try:
+                for name, params, run in benchmarks(datafile):
+                    seconds, items, size = measure(run, min_time)
+                    results.append({
+                        'name': name, 'file': os.path.basename(datafile),
+                        'params': params, 'seconds': seconds,
+                        'items': items, 'bytes': size,
+                        'items_per_s': items / seconds,
+                        'mb_per_s': size / seconds / 1e6})
+                    print(format_result(results[-1]), flush=True)
+            finally:
+                wrappers.close_data_file()
+    finally:
+        wrappers.de_init()
+    return results
+
+
+def result_key(result):
+    return (result['name'], result['file'],
+            json.dumps(result['params'], sort_keys=True))
+
+
+def format_result(result, previous=None):
+    params = ' '.join('{}={}'.format(k, v)
+                      for k, v in result['params'].items())
+    line = '{:<19} {:<20} {:<40} {:>11.1f} us {:>12.0f} /s {:>9.1f} MB/s' \
+        .format(result['name'], result['file'], params,
+                result['seconds'] * 1e6, result['items_per_s'],
+                result['mb_per_s'])
+    if previous is not None:
+        line += ' {:>6.2f}x'.format(previous['seconds'] / result['seconds'])
+    return line
+
+
+def environment():
+    """Return a dict describing what the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=packdir,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': commit, 'dwdat2py': dwdat2py.__version__,
+            'library': wrappers.get_version(),
+            'python': platform.python_version(),
+            'numpy': np.__version__ if np is not None else None,
+            'machine': platform.machine(), 'system': platform.system()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help='about seconds spent per benchmark')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='earlier results file to compare with, the '
+                        'speedup is printed last on each line')
+    parser.add_argument('--output', metavar='FILE',
+                        help='results file to write, default a time '
+                        'stamped file in ' + RESULTSDIR)
+    parser.add_argument('--no-save', action='store_true',
+                        help='do not write a results file')
+    args = parser.parse_args(argv)
+
+    results = run_all(args.min_time)
+    document = {'environment': environment(), 'results': results}
+
+    if args.compare:
+        with open(args.compare) as fo:
+            earlier = json.load(fo)
+        previous = {result_key(r): r for r in earlier['results']}
+        print('\ncompared with {} ({})'.format(
+            args.compare, earlier['environment'].get('commit')))
+        for result in results:
+            print(format_result(result, previous.get(result_key(result))))
+
+    if not args.no_save:
+        output = args.output
+        if output is None:
+            os.makedirs(RESULTSDIR, exist_ok=True)
+            output = os.path.join(
+                RESULTSDIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+        with open(output, 'w') as fo:
+            json.dump(document, fo, indent=1)
+        print('\nresults written to', output)
+
+
+if __name__ == '__main__':
+    main()
@@ -101,14 +101,28 @@ class DWArrayInfo(Structure):
             ("size", c_int)
         ]
 
+# arb_id is an unsigned long of the library, 4 bytes as in the data
+# files, (c_ulong is 8 bytes on Linux)
 class DWCANPortData(Structure):
     _pack_ = 1
     _fields_ =\
         [
-            ("arb_id", c_ulong),
+            ("arb_id", c_uint32),
             ("data", c_char * 8)
         ]
 
+class DWCANFDPortData(Structure):
+    _pack_ = 1
+    _fields_ =\
+        [
+            ("arb_id", c_uint32),
+            ("extended", c_ubyte),
+            ("reserved1", c_ubyte),
+            ("reserved2", c_ubyte),
+            ("dataSize", c_ubyte),
+            ("data", c_ubyte * 64)
+        ]
+
 class DWComplex(Structure):
     _pack_ = 1
     _fields_ =\
@@ -19,11 +19,16 @@ function. It is decorated with a context manager and is the
 recommended way to use the wrappers module. See docstring of
 `wrappersimport`.
 
+To read many files in a row, a `Session` initializes the library once
+and opens and closes the files in turn.
+
 """
 
 
 import os
+import time
 import errno
+from collections import namedtuple
 from contextlib import contextmanager
 
 __version__ = '0.3.3'
@@ -88,8 +93,8 @@ def wrappersimport(fn, fsencoding=None):
     ...    # get the "time stamps" (0)
     ...    time = wi.channel_reduced(chlist[0].index, 0)
 
-    As with importing the wrappers module in the standard way, this will
-    fail if the shared library is not found.
+    This will fail if the shared library is not found, it is loaded at
+    the first call of a wrappers function using it.
 
     """
 
@@ -106,3 +111,138 @@ def wrappersimport(fn, fsencoding=None):
             wrappers.close_data_file()
         if init:
             wrappers.de_init()
+
+
+PhaseTime = namedtuple('PhaseTime', ('count', 'seconds'))
+PhaseTime.__doc__ = """Number of times and total seconds spent in a phase."""
+
+
+class Session:
+    """A library session opening and closing many data files.
+
+    The library is initialized once when the session starts and
+    de-initialized when it ends, instead of around every file as by
+    `wrappersimport`. The session keeps track of the opened file, so
+    the library close function is only called with a file opened.
+
+    Example usage:
+
+    >>> import dwdat2py
+    >>> with dwdat2py.Session() as session:
+    ...     for fn in filenames:
+    ...         with session.file(fn) as wi:
+    ...             print(wi.fileinfo, wi.get_channel_list_count())
+    ...     print(session.timings())
+
+    Time spent in the phases 'init', 'open', 'close' and 'de_init' is
+    recorded, as is time in phases named by the caller with `phase()`.
+    Only one session can be active at a time, the library has one
+    global state per process.
+
+    """
+
+    def __init__(self):
+        self.wrappers = None
+        self.filename = None
+        self.fileinfo = None
+        self._timings = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager adding the time spent in it to phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            count, seconds = self._timings.get(name, (0, 0.0))
+            self._timings[name] = PhaseTime(
+                count + 1, seconds + time.perf_counter() - start)
+
+    def timings(self):
+        """Return a dict phase name --> PhaseTime (count, seconds)."""
+        return dict(self._timings)
+
+    @property
+    def active(self):
+        """True if the session is started and not ended."""
+        return self.wrappers is not None
+
+    @property
+    def is_open(self):
+        """True if a data file is opened by the session."""
+        return self.filename is not None
+
+    def start(self):
+        """Initialize the library, return the wrappers module.
+
+        This will fail if the shared library is not found.
+
+        """
+        if self.active:
+            raise RuntimeError('session already started')
+        from . import wrappers
+        with self.phase('init'):
+            wrappers.init()
+        self.wrappers = wrappers
+        return wrappers
+
+    def open(self, fn, fsencoding=None):
+        """Open the data file `fn`, closing a file opened before.
+
+        Return the FileInfo of the file, also kept as attribute
+        `fileinfo` on the session and on the wrappers module (as by
+        `wrappersimport`). The session is started if it is not.
+
+        """
+        if not self.active:
+            self.start()
+        self.close()
+        with self.phase('open'):
+            fileinfo = self.wrappers.open_data_file(fn, fsencoding)
+        self.filename = fn
+        self.fileinfo = self.wrappers.fileinfo = fileinfo
+        return fileinfo
+
+    def close(self):
+        """Close the opened data file, do nothing if none is opened."""
+        if not self.is_open:
+            return
+        self.filename = self.fileinfo = None
+        with self.phase('close'):
+            stat = self.wrappers.close_data_file()
+        if stat != 0:
+            from . import DWDataReaderHeader as dh
+            raise RuntimeError(dh.DWStatus(stat).name)
+
+    def end(self):
+        """Close the opened file and de-initialize the library."""
+        if not self.active:
+            return
+        try:
+            self.close()
+        finally:
+            with self.phase('de_init'):
+                self.wrappers.de_init()
+            self.wrappers = None
+
+    @contextmanager
+    def file(self, fn, fsencoding=None):
+        """Provide the wrappers module with file `fn` opened.
+
+        Like `wrappersimport` but within the session, the file is
+        closed on exit and the library kept initialized.
+
+        """
+        self.open(fn, fsencoding)
+        try:
+            yield self.wrappers
+        finally:
+            self.close()
+
+    def __enter__(self):
+        if not self.active:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.end()
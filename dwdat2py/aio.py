@@ -0,0 +1,204 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""asyncio interface to Dewesoft data files.
+
+The library functions block, and the library has one opened file per
+process. Here all library calls are run on one dedicated executor
+thread, so the event loop is not blocked and calls from many
+concurrent tasks are queued in the order they are made:
+
+>>> from dwdat2py import aio
+>>> async with aio.open_async('data.d7d') as reader:
+...     async for time, data in reader.iter_samples('GPSvel'):
+...         await send(time, data)
+
+Each reader names its data file. Before a call is run the executor
+thread opens the file of the reader if another file is opened in the
+library, so readers of different files can be used concurrently (at
+the cost of reopening files when calls for them interleave). The
+library is initialized on the executor thread at first use and is
+shut down by `shutdown()`.
+
+Do not use the `wrappers` module directly in the same process while
+readers are in use.
+
+"""
+
+import threading
+import functools
+import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from . import wrappers
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# state of the library, only touched on the executor thread
+_state = {'initialized': False, 'opened': None, 'readers': {}}
+
+
+def _get_executor():
+    """Return the single thread executor, created at first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='dwdat2py-aio')
+        return _executor
+
+
+def _ensure_open(key):
+    """Make the data file of key = (filename, fsencoding) the opened."""
+    if not _state['initialized']:
+        wrappers.init()
+        _state['initialized'] = True
+    if _state['opened'] != key:
+        if _state['opened'] is not None:
+            wrappers.close_data_file()
+            _state['opened'] = None
+        wrappers.open_data_file(*key)
+        _state['opened'] = key
+
+
+def _attach(key):
+    _ensure_open(key)
+    _state['readers'][key] = _state['readers'].get(key, 0) + 1
+
+
+def _detach(key):
+    """Drop one reader of key, close its file if it was the last."""
+    count = _state['readers'].pop(key, 0) - 1
+    if count > 0:
+        _state['readers'][key] = count
+    elif _state['opened'] == key:
+        wrappers.close_data_file()
+        _state['opened'] = None
+
+
+def _in_file(key, func, *args, **kwargs):
+    _ensure_open(key)
+    return func(*args, **kwargs)
+
+
+def _shutdown():
+    if _state['opened'] is not None:
+        wrappers.close_data_file()
+    if _state['initialized']:
+        wrappers.de_init()
+    _state.update(initialized=False, opened=None, readers={})
+
+
+async def _run(func, *args, **kwargs):
+    """Run func(*args, **kwargs) on the executor thread and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs))
+
+
+class AsyncReader:
+    """Async access to one data file, see `open_async()`.
+
+    Every method runs its library calls on the executor thread, with
+    the data file of the reader opened.
+
+    """
+
+    def __init__(self, filename, fsencoding=None):
+        self.filename = filename
+        self.fsencoding = fsencoding
+        self._key = (filename, fsencoding)
+
+    async def call(self, func, *args, **kwargs):
+        """Return func(*args, **kwargs) called with the file opened.
+
+        func is typically a function of the `wrappers` module. Returned
+        values sharing memory with library buffers (numpy arrays with
+        `as_array`) are safe, those buffers are not reused by the
+        wrappers.
+
+        """
+        return await _run(_in_file, self._key, func, *args, **kwargs)
+
+    async def file_info(self):
+        """Return the `wrappers.FileInfo` of the file."""
+        return await self.call(wrappers.file_info)
+
+    async def channel_catalog(self, encoding=None):
+        """Return the `wrappers.ChannelCatalog` of the file."""
+        return await self.call(wrappers.channel_catalog, encoding)
+
+    async def read_window(self, channel, t0, t1, as_array=False,
+                          encoding=None):
+        """Return (time_stamp, data) as from `wrappers.read_window()`."""
+        return await self.call(wrappers.read_window, channel, t0, t1,
+                               as_array, encoding)
+
+    async def iter_samples(self, channel, chunk=65536, position=0,
+                           count=None, as_array=False, encoding=None):
+        """Yield "full speed" (time_stamp, data) of `channel` in chunks.
+
+        As `wrappers.iter_scaled_samples()` but the channel can be given
+        by name and each chunk is read by a separate call on the
+        executor thread, so other tasks get their calls in between.
+        Chunks are not overwritten by later chunks.
+
+        """
+
+        def setup():
+            index = wrappers.channel_index(channel, encoding)
+            array_size = wrappers.channel_catalog(encoding) \
+                .by_index[index].array_size
+            total = count
+            if total is None:
+                total = wrappers.get_scaled_samples_count(index) - position
+            return index, array_size, total
+
+        index, array_size, total = await self.call(setup)
+        end = position + total
+        while position < end:
+            n = min(chunk, end - position)
+            yield await self.call(wrappers.get_scaled_samples, index,
+                                  position, n, array_size, as_array)
+            position += n
+
+
+@asynccontextmanager
+async def open_async(filename, fsencoding=None):
+    """Async context manager giving an `AsyncReader` for `filename`.
+
+    The file is opened on entry, (errors opening it are raised here),
+    and closed on exit unless other readers of the same file remain.
+    `fsencoding` is as for `wrappers.open_data_file()`.
+
+    """
+
+    reader = AsyncReader(filename, fsencoding)
+    await _run(_attach, reader._key)
+    try:
+        yield reader
+    finally:
+        await _run(_detach, reader._key)
+
+
+async def shutdown():
+    """Close any opened file and de-initialize the library.
+
+    Run after the calls already queued. The executor is kept, the
+    library is initialized again by the next call.
+
+    """
+    await _run(_shutdown)
@@ -0,0 +1,185 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Align channels of the opened data file to a common time base.
+
+Channels in a file have their own time stamps, (sync channels of
+different rates, async channels). `iter_aligned()` resamples a list of
+channels to one time grid, a fixed rate or the time stamps of a
+reference channel, and yields 2-D blocks with one column per channel.
+Source and target are processed in chunks, so memory use does not
+depend on the length of the recording. `align()` collects all blocks.
+
+The file must be opened with `wrappers.open_data_file()` (or
+`dwdat2py.wrappersimport()`). Requires numpy.
+
+>>> from dwdat2py import align
+>>> time, values = align.align(['GPSvel', 'ENG_RPM'], rate=10)
+
+"""
+
+import math
+
+import numpy as np
+
+from . import wrappers
+
+METHODS = ('linear', 'previous', 'nearest')
+
+
+class _ChannelStream:
+    """Source samples of one channel read ahead in chunks.
+
+    The buffer holds the samples needed to interpolate at target times
+    from the latest `cover()` call, including the sample before and the
+    sample after, and is trimmed by `trim()` to keep memory bounded.
+
+    """
+
+    def __init__(self, index, t0, chunk):
+        position, _ = wrappers.window_positions(index, t0, t0)
+        self.chunks = wrappers.iter_scaled_samples(
+            index, chunk, position=max(0, position - 1), as_array=True)
+        self.time = np.empty(0)
+        self.data = np.empty(0)
+        self.exhausted = False
+
+    def cover(self, t_end):
+        """Read until the buffer has a sample after t_end (or the end)."""
+        while not self.exhausted and (len(self.time) == 0
+                                      or self.time[-1] <= t_end):
+            try:
+                time, data = next(self.chunks)
+            except StopIteration:
+                self.exhausted = True
+            else:
+                # copy, the chunk buffers are reused
+                self.time = np.concatenate((self.time, time))
+                self.data = np.concatenate((self.data, data))
+
+    def trim(self, t_next):
+        """Drop samples not needed for target times >= t_next."""
+        keep = max(0, np.searchsorted(self.time, t_next, 'right') - 1)
+        self.time = self.time[keep:]
+        self.data = self.data[keep:]
+
+    def sample(self, t, method):
+        """Return channel values at times t (nan outside the channel)."""
+        time, data = self.time, self.data
+        if len(time) == 0:
+            return np.full(len(t), np.nan)
+        if method == 'linear':
+            return np.interp(t, time, data, left=np.nan, right=np.nan)
+        after = np.searchsorted(time, t, 'right')
+        if method == 'previous':
+            values = data[np.maximum(after - 1, 0)]
+            values[after == 0] = np.nan
+            return values
+        # nearest, pick the previous sample unless the next is closer
+        prev = np.maximum(after - 1, 0)
+        nxt = np.minimum(after, len(time) - 1)
+        use_next = np.abs(time[nxt] - t) < np.abs(t - time[prev])
+        values = data[np.where(use_next, nxt, prev)]
+        values[after == 0] = np.nan
+        return values
+
+
+def _target_times(rate, reference, t0, t1, chunk, encoding):
+    """Yield chunks of target time stamps in [t0, t1)."""
+    if reference is not None:
+        index = wrappers.channel_index(reference, encoding)
+        array_size = wrappers.channel_catalog(encoding) \
+            .by_index[index].array_size
+        position, count = wrappers.window_positions(index, t0, t1)
+        for time, _ in wrappers.iter_scaled_samples(
+                index, chunk, array_size, position=position, count=count,
+                as_array=True):
+            yield time.copy()
+        return
+    total = max(0, math.ceil((t1 - t0) * rate - 1e-9))
+    for k in range(0, total, chunk):
+        yield t0 + np.arange(k, min(k + chunk, total)) / rate
+
+
+def iter_aligned(channels, rate=None, reference=None, method='linear',
+                 t0=0.0, t1=None, chunk=65536, encoding=None):
+    """Yield (time_stamp, values) blocks of `channels` on one time base.
+
+    time_stamp is a 1-D array of target times and values a 2-D array
+    shaped (len(time_stamp), len(channels)), with nan where a channel
+    has no value (before its first sample, and after its last sample
+    for linear interpolation).
+
+    channels : sequence
+        Channel indexes or names (not array channels).
+
+    rate : float (or None)
+        Target sample rate in Hz, time stamps are t0 + k / rate.
+
+    reference : int or str (or None)
+        Channel whose time stamps are the target time stamps, used
+        instead of rate. May be an array channel.
+
+    method : str
+        'linear' interpolation, 'previous' value (sample and hold) or
+        'nearest' value.
+
+    t0, t1 : float
+        The time window. t1 defaults to the duration of the file.
+
+    chunk : int
+        Number of target time stamps per block, also the number of
+        source samples read at a time.
+
+    encoding : str
+        Passed to `wrappers.channel_index()`.
+
+    """
+
+    if method not in METHODS:
+        raise ValueError('method not one of', METHODS, method)
+    if (rate is None) == (reference is None):
+        raise ValueError('give one of rate or reference')
+    indexes = [wrappers.channel_index(ch, encoding) for ch in channels]
+    catalog = wrappers.channel_catalog(encoding)
+    for index in indexes:
+        if catalog.by_index[index].array_size != 1:
+            raise ValueError('cannot align array channel', index)
+    if t1 is None:
+        t1 = wrappers.file_info().duration
+
+    streams = [_ChannelStream(index, t0, chunk) for index in indexes]
+    for time in _target_times(rate, reference, t0, t1, chunk, encoding):
+        values = np.empty((len(time), len(streams)))
+        for column, stream in enumerate(streams):
+            stream.cover(time[-1])
+            values[:, column] = stream.sample(time, method)
+            stream.trim(time[-1])
+        yield time, values
+
+
+def align(channels, rate=None, reference=None, method='linear', t0=0.0,
+          t1=None, chunk=65536, encoding=None):
+    """Return (time_stamp, values) of `channels` on one time base.
+
+    All blocks from `iter_aligned()`, which see, concatenated.
+
+    """
+
+    times, blocks = [np.empty(0)], [np.empty((0, len(channels)))]
+    for time, values in iter_aligned(channels, rate, reference, method, t0,
+                                     t1, chunk, encoding):
+        times.append(time)
+        blocks.append(values)
+    return np.concatenate(times), np.concatenate(blocks)
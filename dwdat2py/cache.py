@@ -0,0 +1,240 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in caches of data read from Dewesoft data files.
+
+Cached entries are keyed by the identity of the data file, its absolute
+path, size and modification time, so a changed file is read again.
+
+`file_metadata()` caches what is in a file (file info, channel list,
+sample counts and factors) in a small JSON file, either a sidecar next
+to the data file or in a cache directory. A cache hit does not touch
+the shared library.
+
+`cached_samples()` caches decoded full speed channel data in .npy files
+in a cache directory and serves them memory-mapped, so later reads are
+fast and share the OS page cache between processes. Requires numpy.
+
+"""
+
+import os
+import json
+import hashlib
+from collections import namedtuple
+
+import dwdat2py
+
+CACHE_VERSION = 1
+"""Stored with every entry, entries of other versions are not used."""
+
+SIDECAR_SUFFIX = '.dwmeta.json'
+
+FileMeta = namedtuple('FileMeta', ('sample_rate', 'start_store_time',
+                                   'duration', 'storing_type', 'channels'))
+
+ChannelMeta = namedtuple('ChannelMeta',
+                         ('index', 'name', 'unit', 'description', 'color',
+                          'array_size', 'data_type', 'long_name',
+                          'scaled_count', 'reduced_count', 'block_size',
+                          'scale', 'offset'))
+
+
+def file_identity(path):
+    """Return (abspath, size, mtime_ns) identifying the file `path`."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return path, st.st_size, st.st_mtime_ns
+
+
+def file_key(path):
+    """Return a hex digest string of `file_identity(path)`."""
+    identity = repr(file_identity(path)).encode('utf-8', 'surrogateescape')
+    return hashlib.sha1(identity).hexdigest()
+
+
+def _metadata_path(path, cachedir):
+    """Return the name of the file_metadata cache entry of path."""
+    if cachedir is None:
+        return path + SIDECAR_SUFFIX
+    return os.path.join(cachedir, file_key(path) + '.json')
+
+
+def _write_json(filename, obj):
+    """Write obj as json to filename atomically."""
+    tmp = '{}.{}.tmp'.format(filename, os.getpid())
+    with open(tmp, 'w', encoding='utf-8') as fo:
+        json.dump(obj, fo)
+    os.replace(tmp, filename)
+
+
+def _read_metadata(wi, encoding):
+    """Return a FileMeta for the file opened in wrappers module wi."""
+    catalog = wi.channel_catalog(encoding)
+    channels = []
+    for ch in catalog.channels:
+        reduced_count, block_size = wi.get_reduced_values_count(ch.index)
+        scale, offset = wi.get_channel_factors(ch.index)
+        channels.append(ChannelMeta(
+            *ch, catalog.long_names[ch.index],
+            wi.get_scaled_samples_count(ch.index), reduced_count,
+            block_size, scale, offset))
+    return FileMeta(*wi.fileinfo, wi.get_storing_type(), channels)
+
+
+def file_metadata(path, cachedir=None, encoding=None, fsencoding=None):
+    """Return a `FileMeta` with what is in the data file `path`.
+
+    The members of FileMeta are sample_rate, start_store_time and
+    duration (as in `wrappers.FileInfo`), storing_type (as from
+    `wrappers.get_storing_type()`) and channels, a list of
+    `ChannelMeta` holding the members of `wrappers.Channel`, the
+    channel long name, the number of scaled samples, the number of
+    reduced values and their block size and the channel scale and
+    offset.
+
+    If a valid cache entry exists it is returned without loading the
+    library. Else the file is read using `dwdat2py.wrappersimport()`
+    (so no other file can be open in the library) and the cache entry
+    is written, if possible, (a read-only directory only means no
+    caching).
+
+    path : str
+        Name of the data file.
+
+    cachedir : str (or None)
+        Directory to keep cache entries in. If None, the entry is a
+        sidecar file next to the data file, named as the data file with
+        `SIDECAR_SUFFIX` appended.
+
+    encoding, fsencoding
+        Passed to `wrappers.channel_catalog()` and
+        `wrappers.open_data_file()` respectively.
+
+    """
+
+    identity = file_identity(path)
+    metapath = _metadata_path(path, cachedir)
+    try:
+        with open(metapath, encoding='utf-8') as fo:
+            entry = json.load(fo)
+    except (OSError, ValueError):
+        entry = None
+
+    if (entry and entry.get('version') == CACHE_VERSION
+            and entry.get('identity') == list(identity)
+            and entry.get('encoding') == encoding):
+        meta = entry['meta']
+        meta[-1] = [ChannelMeta(*ch) for ch in meta[-1]]
+        return FileMeta(*meta)
+
+    with dwdat2py.wrappersimport(path, fsencoding) as wi:
+        meta = _read_metadata(wi, encoding)
+    try:
+        if cachedir is not None:
+            os.makedirs(cachedir, exist_ok=True)
+        _write_json(metapath, {'version': CACHE_VERSION,
+                               'identity': identity,
+                               'encoding': encoding, 'meta': meta})
+    except OSError:
+        pass
+    return meta
+
+
+def _samples_paths(path, cachedir, index):
+    """Return names of the (time_stamp, data) .npy files of channel index."""
+    dirname = os.path.join(cachedir, file_key(path))
+    return tuple(os.path.join(dirname, 'ch{}.{}.npy'.format(index, part))
+                 for part in ('time_stamp', 'data'))
+
+
+def _write_samples(wi, index, array_size, filenames, chunk):
+    """Write full speed data of channel index to .npy filenames."""
+    from numpy.lib.format import open_memmap
+
+    os.makedirs(os.path.dirname(filenames[0]), exist_ok=True)
+    count = wi.get_scaled_samples_count(index)
+    shapes = ((count,),
+              (count,) if array_size == 1 else (count, array_size))
+    tmps = ['{}.{}.tmp'.format(fn, os.getpid()) for fn in filenames]
+    time, data = (open_memmap(tmp, 'w+', 'f8', shape)
+                  for tmp, shape in zip(tmps, shapes))
+    position = 0
+    for ctime, cdata in wi.iter_scaled_samples(index, chunk, array_size,
+                                               as_array=True):
+        n = len(ctime)
+        time[position:position + n] = ctime
+        data[position:position + n] = cdata
+        position += n
+    del time, data                  # flush and close the memmaps
+    for tmp, fn in zip(tmps, filenames):
+        os.replace(tmp, fn)
+
+
+def cached_samples(path, channels, cachedir, chunk=65536, encoding=None,
+                   fsencoding=None):
+    """Return full speed data of `channels` in `path` using a cache.
+
+    Return a dict channel --> (time_stamp, data), numpy arrays like
+    from `wrappers.get_scaled_samples()` with `as_array` True, but
+    read-only and memory-mapped from .npy files in `cachedir`.
+
+    Channels not in the cache are read with
+    `wrappers.iter_scaled_samples()` and written to the cache first,
+    opening `path` with `dwdat2py.wrappersimport()` once for all of
+    them. Channel names are resolved by `file_metadata()`, using the
+    same cache directory.
+
+    path : str
+        Name of the data file.
+
+    channels : sequence
+        Channel indexes or names (or long names).
+
+    cachedir : str
+        The cache directory. Entries are in a sub-directory named by
+        `file_key(path)`.
+
+    chunk : int
+        Number of samples read at a time when filling the cache.
+
+    encoding, fsencoding
+        Passed to `file_metadata()`.
+
+    """
+
+    import numpy as np
+
+    meta = file_metadata(path, cachedir, encoding, fsencoding)
+    by_index = {ch.index: ch for ch in meta.channels}
+    by_name = {ch.long_name: ch for ch in meta.channels}
+    by_name.update((ch.name, ch) for ch in meta.channels)
+
+    requested = {}
+    for channel in channels:
+        ch = (by_index if type(channel) is int else by_name).get(channel)
+        if ch is None:
+            raise ValueError(channel, 'not found in data')
+        requested[channel] = ch, _samples_paths(path, cachedir, ch.index)
+
+    missing = {ch.index: (ch, filenames)
+               for ch, filenames in requested.values()
+               if not all(os.path.exists(fn) for fn in filenames)}
+    if missing:
+        with dwdat2py.wrappersimport(path, fsencoding) as wi:
+            for ch, filenames in missing.values():
+                _write_samples(wi, ch.index, ch.array_size, filenames,
+                               chunk)
+
+    return {channel: tuple(np.load(fn, mmap_mode='r') for fn in filenames)
+            for channel, (_, filenames) in requested.items()}
@@ -0,0 +1,186 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Decode CAN channel data to numpy structured arrays.
+
+CAN port channels (dtCANPortData, dtCANFDPortData) are binary channels
+read by `wrappers.get_binary_samples()`. Here the samples are decoded
+to structured arrays of frames, with all frames handled at once:
+
+>>> from dwdat2py import can
+>>> frames = can.read_frames(ch_index)
+>>> engine = can.filter_ids(frames, [0x0C8])
+>>> rpm = can.extract_signal(engine, 24, 16, factor=0.25)
+
+The sample layouts are the DWCANPortData and DWCANFDPortData
+structures of `DWDataReaderHeader`, also used by `wrappers` to size
+the read buffer. Requires numpy.
+
+"""
+
+import numpy as np
+
+from . import DWDataReaderHeader as dh
+
+CAN_FRAME_DTYPE = np.dtype([('time_stamp', np.float64),
+                            ('arb_id', np.uint32),
+                            ('dlc', np.uint8),
+                            ('payload', np.uint8, (8,))])
+
+CANFD_FRAME_DTYPE = np.dtype([('time_stamp', np.float64),
+                              ('arb_id', np.uint32),
+                              ('extended', np.uint8),
+                              ('dlc', np.uint8),
+                              ('payload', np.uint8, (64,))])
+
+# record layouts of classic and FD samples
+_RECORD_DTYPE = {False: np.dtype(dh.DWCANPortData),
+                 True: np.dtype(dh.DWCANFDPortData)}
+
+
+def _records(offsets, data, size):
+    """Return the binary samples as a 2-D uint8 array (count, size).
+
+    Samples shorter than size are zero padded, longer are cut.
+
+    """
+    count = len(offsets) - 1
+    lengths = np.diff(offsets)
+    if (lengths == size).all():
+        return data[:count * size].reshape(count, size)
+    records = np.zeros((count, size), np.uint8)
+    rows = np.repeat(np.arange(count), lengths)
+    cols = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+    keep = cols < size
+    records[rows[keep], cols[keep]] = data[:offsets[-1]][keep]
+    return records
+
+
+def decode_frames(samples, fd=False):
+    """Return frames of binary `samples` as a numpy structured array.
+
+    samples : BinarySamples
+        As returned by `wrappers.get_binary_samples()` with `as_array`
+        True, (time_stamp, offsets, data).
+
+    fd : bool
+        If True, samples are CAN FD frames (dtCANFDPortData) decoded to
+        `CANFD_FRAME_DTYPE`, else classic CAN frames (dtCANPortData)
+        decoded to `CAN_FRAME_DTYPE`.
+
+    The dlc field is the number of data bytes. For classic frames it
+    is derived from the sample length, for FD frames it is the dataSize
+    member of the record.
+
+    """
+
+    time_stamp, offsets, data = samples
+    offsets = np.asarray(offsets, np.int64)
+    data = np.frombuffer(data, np.uint8)
+    dtype = _RECORD_DTYPE[fd]
+    records = _records(offsets, data, dtype.itemsize)
+    start = dtype.fields['data'][1]         # offset of the data member
+    payload = records[:, start:]
+    records = np.ascontiguousarray(records).view(dtype)[:, 0]
+
+    frames = np.zeros(len(records), CANFD_FRAME_DTYPE if fd
+                      else CAN_FRAME_DTYPE)
+    frames['time_stamp'] = time_stamp
+    frames['arb_id'] = records['arb_id']
+    if fd:
+        frames['extended'] = records['extended']
+        frames['dlc'] = records['dataSize']
+    else:
+        frames['dlc'] = np.clip(np.diff(offsets) - start, 0, 8)
+    frames['payload'] = payload
+    return frames
+
+
+def read_frames(ch_index, position=0, count=None, data_type=None):
+    """Read and decode frames of CAN channel `ch_index`.
+
+    Read `count` samples from `position` (to the end of the channel if
+    count is None) with `wrappers.get_binary_samples()` and return
+    them decoded by `decode_frames()`. data_type (Channel.data_type) is
+    looked up if None and tells if the channel is CAN FD.
+
+    """
+
+    from . import wrappers
+
+    if data_type is None:
+        data_type = wrappers.get_channel_props(
+            ch_index, dh.DWChannelProps.DW_DATA_TYPE.value)
+    if count is None:
+        count = wrappers.get_binary_samples_count(ch_index) - position
+    samples = wrappers.get_binary_samples(ch_index, position, count,
+                                          data_type=data_type,
+                                          as_array=True)
+    fd = data_type == dh.DWDataType.dtCANFDPortData.value
+    return decode_frames(samples, fd)
+
+
+def filter_ids(frames, arb_ids):
+    """Return the frames with an arbitration id in `arb_ids`."""
+    return frames[np.isin(frames['arb_id'], arb_ids)]
+
+
+def extract_signal(frames, start_bit, length, factor=1.0, offset=0.0,
+                   byte_order='little', signed=False):
+    """Return a signal from the payload of all `frames` as float64.
+
+    The raw value is the `length` bits at `start_bit`, the physical
+    value is raw * factor + offset.
+
+    byte_order : str
+        'little' (Intel) or 'big' (Motorola). For 'little' start_bit is
+        the least significant bit, for 'big' it is the most significant
+        bit, (the DBC file conventions).
+
+    signed : bool
+        If True the raw value is two's complement.
+
+    A signal may span at most 8 bytes of the payload.
+
+    """
+
+    payload = frames['payload']
+    count, size = payload.shape
+    padded = np.zeros((count, size + 8), np.uint8)
+    padded[:, :size] = payload
+    first = start_bit // 8
+    if byte_order == 'little':
+        shift = start_bit % 8
+        dtype = '<u8'
+    elif byte_order == 'big':
+        shift = 56 + start_bit % 8 - length + 1
+        dtype = '>u8'
+    else:
+        raise ValueError('byte_order not little or big', byte_order)
+    if not 0 < length <= 64 or shift < 0 or shift + length > 64 \
+       or first >= size:
+        raise ValueError('signal does not fit in 8 payload bytes',
+                         start_bit, length)
+
+    window = padded[:, first:first + 8].copy().view(dtype)[:, 0]
+    raw = (window >> np.uint64(shift)).astype(np.uint64)
+    if length < 64:
+        raw &= np.uint64((1 << length) - 1)
+    if signed:
+        raw = raw.astype(np.int64)
+        if length < 64:
+            raw -= (raw >> (length - 1) & 1) << length
+    else:
+        raw = raw.astype(np.float64)
+    return raw * factor + offset
@@ -0,0 +1,153 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Plot ready decimation of channels in the opened data file.
+
+`downsample()` returns about `n_points` points of a channel in a time
+window. The reduced values stored in the file (`get_reduced_values()`)
+already have min and max per block, so they are used when their block
+size is fine enough for the requested resolution. Only when zoomed in
+past the reduced resolution the full speed samples of the window are
+read, in chunks for the min/max method.
+
+The file must be opened with `wrappers.open_data_file()` (or
+`dwdat2py.wrappersimport()`). Requires numpy.
+
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from . import wrappers
+
+Downsampled = namedtuple('Downsampled',
+                         ('time_stamp', 'min', 'max', 'source'))
+Downsampled.__doc__ = """Result of `downsample()`.
+
+time_stamp, min and max are arrays with one element per point, source
+is 'reduced' or 'full' telling which data was used. With the lttb
+method on full data min and max are the same array of selected sample
+values.
+"""
+
+
+def _bucket_minmax(time, values, t0, width, n_points, lo, hi):
+    """Update per bucket minimum lo and maximum hi in place."""
+    buckets = ((time - t0) // width).astype(np.intp)
+    keep = (buckets >= 0) & (buckets < n_points)
+    np.fmin.at(lo, buckets[keep], values[keep])
+    np.fmax.at(hi, buckets[keep], values[keep])
+
+
+def _reduced(index, t0, t1, n_points, block_size, count):
+    """Return Downsampled from the reduced values of channel index."""
+    first = min(max(0, math.floor(t0 / block_size)), count)
+    last = min(max(first, math.ceil(t1 / block_size)), count)
+    records = wrappers.get_reduced_values(index, first, last - first,
+                                          as_array=True)
+    width = (t1 - t0) / n_points
+    lo = np.full(n_points, np.nan)
+    hi = np.full(n_points, np.nan)
+    time = records['time_stamp']
+    _bucket_minmax(time, records['min'], t0, width, n_points, lo, hi)
+    _bucket_minmax(time, records['max'], t0, width, n_points, lo, hi)
+    return Downsampled(t0 + np.arange(n_points) * width, lo, hi, 'reduced')
+
+
+def _full_minmax(index, t0, t1, n_points, chunk):
+    """Return min/max Downsampled streaming full speed samples."""
+    position, count = wrappers.window_positions(index, t0, t1)
+    width = (t1 - t0) / n_points
+    lo = np.full(n_points, np.nan)
+    hi = np.full(n_points, np.nan)
+    for time, data in wrappers.iter_scaled_samples(
+            index, chunk, position=position, count=count, as_array=True):
+        _bucket_minmax(time, data, t0, width, n_points, lo, hi)
+    return Downsampled(t0 + np.arange(n_points) * width, lo, hi, 'full')
+
+
+def lttb(time, data, n_points):
+    """Return (time, data) decimated to `n_points` by LTTB.
+
+    Largest-Triangle-Three-Buckets selects the first and last samples
+    and from each of n_points - 2 buckets in between the sample forming
+    the largest triangle with the previous selected sample and the
+    average of the next bucket.
+
+    """
+
+    time = np.asarray(time, np.float64)
+    data = np.asarray(data, np.float64)
+    size = len(time)
+    if n_points >= size or n_points < 3:
+        return time.copy(), data.copy()
+
+    edges = np.linspace(1, size - 1, n_points - 1).astype(np.intp)
+    selected = np.empty(n_points, np.intp)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(n_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        nxt = slice(stop, edges[i + 2]) if i + 2 < len(edges) \
+            else slice(size - 1, size)
+        avg_t, avg_d = time[nxt].mean(), data[nxt].mean()
+        area = np.abs((time[a] - avg_t) * (data[start:stop] - data[a])
+                      - (time[a] - time[start:stop]) * (avg_d - data[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return time[selected], data[selected]
+
+
+def downsample(channel, t0, t1, n_points, method='minmax', chunk=65536,
+               encoding=None):
+    """Return `channel` in the time window [t0, t1) as about n_points.
+
+    Return a `Downsampled` (time_stamp, min, max, source).
+
+    The window is divided in n_points buckets of equal width. If the
+    block size of the reduced values of the channel is not larger than
+    the bucket width, min and max of each bucket are taken from the
+    reduced values, (source 'reduced'). Else the full speed samples in
+    the window are used, (source 'full'), by `method`:
+
+    'minmax'
+        min and max of the samples in each bucket, read in chunks of
+        `chunk` samples. Empty buckets are nan.
+
+    'lttb'
+        n_points samples selected by `lttb()`.
+
+    `encoding` is passed to `wrappers.channel_index()`. Array channels
+    are not supported, (ValueError).
+
+    """
+
+    if method not in ('minmax', 'lttb'):
+        raise ValueError('method not minmax or lttb', method)
+    if n_points < 1 or t1 <= t0:
+        raise ValueError('need n_points > 0 and t1 > t0', n_points, t0, t1)
+    index = wrappers.channel_index(channel, encoding)
+    if wrappers.channel_catalog(encoding).by_index[index].array_size != 1:
+        raise ValueError('no downsample of array channel', channel)
+    count, block_size = wrappers.get_reduced_values_count(index)
+    if count and 0 < block_size <= (t1 - t0) / n_points:
+        return _reduced(index, t0, t1, n_points, block_size, count)
+    if method == 'minmax':
+        return _full_minmax(index, t0, t1, n_points, chunk)
+    time, data = wrappers.read_window(index, t0, t1, as_array=True,
+                                      encoding=encoding)
+    time, data = lttb(time, data, n_points)
+    return Downsampled(time, data, data, 'full')
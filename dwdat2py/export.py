@@ -0,0 +1,194 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export Dewesoft data files to Parquet or HDF5.
+
+Full speed data of each channel is streamed in chunks with
+`wrappers.iter_scaled_samples()`, so memory use does not depend on the
+length of the recording. Channels have their own time stamps (sync
+channels of different rates, async channels), so each channel is
+exported separately with a time_stamp and a data column:
+
+HDF5
+    One file with a group per channel named ``ch<index>``, holding the
+    datasets time_stamp and data. data is 2-D (count, array_size) for
+    array channels. Channel info is stored as attributes on the group,
+    file info as attributes on the root.
+
+Parquet
+    A directory with one file per channel named ``ch<index>.parquet``.
+    data is a fixed size list column for array channels. Channel and
+    file info is stored as schema metadata.
+
+Requires numpy and h5py or pyarrow respectively. Use the `export()`
+function or the ``dwdat2py-export`` command.
+
+"""
+
+import os
+import argparse
+
+import dwdat2py
+from . import DWDataReaderHeader as dh
+
+FORMATS = {'.h5': 'hdf5', '.hdf5': 'hdf5', '.parquet': 'parquet',
+           '.pq': 'parquet'}
+"""File name extension --> format, used if format is not given."""
+
+
+def _channel_info(wi, ch, long_name):
+    """Return a dict with info on channel ch, for metadata."""
+    ch_type = wi.get_channel_props(ch.index,
+                                   dh.DWChannelProps.DW_CH_TYPE.value)
+    scale, offset = wi.get_channel_factors(ch.index)
+    return {'index': ch.index, 'name': ch.name, 'long_name': long_name,
+            'unit': ch.unit, 'description': ch.description,
+            'array_size': ch.array_size, 'data_type': ch.data_type,
+            'channel_type': dh.DWChannelType(ch_type).name,
+            'scale': scale, 'offset': offset}
+
+
+def _write_hdf5(wi, fileinfo, outpath, channels, chunk, encoding):
+    import h5py
+
+    catalog = wi.channel_catalog(encoding)
+    with h5py.File(outpath, 'w') as h5:
+        h5.attrs.update(fileinfo._asdict())
+        for index in channels:
+            ch = catalog.by_index[index]
+            grp = h5.create_group('ch{}'.format(index))
+            grp.attrs.update(_channel_info(wi, ch, catalog.long_names[index]))
+            shape = (0,) if ch.array_size == 1 else (0, ch.array_size)
+            tds = grp.create_dataset('time_stamp', (0,), 'f8',
+                                     maxshape=(None,), chunks=True)
+            dds = grp.create_dataset('data', shape, 'f8',
+                                     maxshape=(None,) + shape[1:],
+                                     chunks=True)
+            for time, data in wi.iter_scaled_samples(index, chunk,
+                                                     ch.array_size,
+                                                     as_array=True):
+                n = len(tds)
+                tds.resize(n + len(time), 0)
+                dds.resize(n + len(time), 0)
+                tds[n:] = time
+                dds[n:] = data
+
+
+def _write_parquet(wi, fileinfo, outpath, channels, chunk, encoding):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    catalog = wi.channel_catalog(encoding)
+    os.makedirs(outpath, exist_ok=True)
+    for index in channels:
+        ch = catalog.by_index[index]
+        metadata = dict(fileinfo._asdict(),
+                        **_channel_info(wi, ch, catalog.long_names[index]))
+        if ch.array_size == 1:
+            data_type = pa.float64()
+        else:
+            data_type = pa.list_(pa.float64(), ch.array_size)
+        schema = pa.schema([('time_stamp', pa.float64()),
+                            ('data', data_type)],
+                           metadata={k: str(v) for k, v in metadata.items()})
+        filename = os.path.join(outpath, 'ch{}.parquet'.format(index))
+        with pq.ParquetWriter(filename, schema) as writer:
+            for time, data in wi.iter_scaled_samples(index, chunk,
+                                                     ch.array_size,
+                                                     as_array=True):
+                if ch.array_size > 1:
+                    data = pa.FixedSizeListArray.from_arrays(
+                        pa.array(data.ravel()), ch.array_size)
+                writer.write_table(pa.table([time, data], schema=schema))
+
+
+_WRITERS = {'hdf5': _write_hdf5, 'parquet': _write_parquet}
+
+
+def export(datafile, outpath, format=None, channels=None, chunk=65536,
+           encoding=None, fsencoding=None):
+    """Export full speed data of `datafile` to `outpath`.
+
+    datafile : str
+        The Dewesoft data file to export.
+
+    outpath : str
+        The HDF5 file or the Parquet directory to write.
+
+    format : str (or None)
+        'hdf5' or 'parquet'. If None, it is found from the extension of
+        `outpath` by `FORMATS`.
+
+    channels : sequence (or None)
+        Channel indexes or names to export, all channels if None.
+
+    chunk : int
+        Number of samples read and written at a time.
+
+    encoding, fsencoding
+        Passed to `wrappers.channel_catalog()` and
+        `wrappers.open_data_file()` respectively.
+
+    """
+
+    if format is None:
+        ext = os.path.splitext(outpath)[1].lower()
+        try:
+            format = FORMATS[ext]
+        except KeyError:
+            raise ValueError('cannot tell format from extension', ext) \
+                from None
+    try:
+        writer = _WRITERS[format]
+    except KeyError:
+        raise ValueError('unknown format', format) from None
+
+    with dwdat2py.wrappersimport(datafile, fsencoding) as wi:
+        if channels is None:
+            indexes = [ch.index for ch in wi.channel_catalog(encoding)
+                       .channels]
+        else:
+            indexes = [wi.channel_index(ch, encoding) for ch in channels]
+        writer(wi, wi.fileinfo, outpath, indexes, chunk, encoding)
+
+
+def main(argv=None):
+    """Entry point of the dwdat2py-export command."""
+    parser = argparse.ArgumentParser(
+        prog='dwdat2py-export',
+        description='Export Dewesoft data files to HDF5 or Parquet.')
+    parser.add_argument('datafile', help='Dewesoft data file to export')
+    parser.add_argument('outpath', help='HDF5 file or Parquet directory')
+    parser.add_argument('-f', '--format', choices=sorted(_WRITERS),
+                        help='output format, default from outpath extension')
+    parser.add_argument('-c', '--channel', action='append', dest='channels',
+                        help='channel index or name to export, can be '
+                        'repeated, default all channels')
+    parser.add_argument('--chunk', type=int, default=65536,
+                        help='samples per read (default %(default)s)')
+    parser.add_argument('--encoding', help='encoding of channel names')
+    args = parser.parse_args(argv)
+
+    channels = args.channels
+    if channels is not None:
+        channels = [int(ch) if ch.isdigit() else ch for ch in channels]
+    try:
+        export(args.datafile, args.outpath, args.format, channels,
+               args.chunk, args.encoding)
+    except (ValueError, RuntimeError, OSError) as e:
+        parser.exit(1, '{}: error: {}\n'.format(parser.prog, e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in instrumentation of the calls made by the wrappers module.
+
+When enabled, every library function and every public function of
+`wrappers` is timed. For each function `stats()` gives the number of
+calls, the wall time, the part of it spent inside the library and the
+approximate number of bytes returned. For the public functions, time
+not in the library is the Python side of the call, (argument and
+result conversion):
+
+>>> from dwdat2py import instrument, wrappers
+>>> instrument.enable()
+>>> time, data = wrappers.get_scaled_samples(0, 0, 1000)
+>>> s = instrument.stats()['get_scaled_samples']
+>>> s.seconds - s.lib_seconds       # python conversion
+
+Hooks added by `add_hook()` are called after each timed call.
+
+Instrumentation works by replacing the functions in the namespace of
+the wrappers module, and `disable()` puts the originals back. So there
+is no overhead when disabled, but references to wrappers functions
+taken before `enable()` (from wrappers import get_scaled_samples) are
+not timed. Generator functions are not timed themselves, the library
+calls they make are.
+
+"""
+
+import time
+import types
+import inspect
+import threading
+import functools
+from collections import namedtuple
+
+from . import wrappers
+
+CallStats = namedtuple('CallStats',
+                       ('calls', 'seconds', 'lib_seconds', 'nbytes'))
+CallStats.__doc__ = """Statistics of calls to one function.
+
+calls is the number of calls, seconds the total wall time of the calls,
+lib_seconds the part of seconds spent in library functions and nbytes
+the approximate total size of returned data. Library functions are
+named as in the library (DWGetScaledSamples) and have lib_seconds equal
+to seconds and nbytes 0.
+"""
+
+_EXCLUDED = {'load_library'}
+_SUMMED_TUPLE = 4               # tuples up to this length are summed
+
+_lock = threading.Lock()
+_local = threading.local()      # lib, library seconds of current call
+_stats = {}                     # name --> [calls, seconds, lib, nbytes]
+_hooks = []
+_originals = {}                 # wrappers global name --> original
+
+
+def _nbytes(value):
+    """Return the approximate size in bytes of the data in value.
+
+    Numbers count as 8 bytes and strings by their length. The items of
+    namedtuples and short tuples, (like the (time_stamp, data) pairs),
+    are summed, longer sequences are taken to hold items of the same
+    size as the first item.
+
+    """
+    if isinstance(value, (int, float)):
+        return 8
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    nbytes = getattr(value, 'nbytes', None)     # numpy, memoryview
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, tuple) and (hasattr(value, '_fields')
+                                     or len(value) <= _SUMMED_TUPLE):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, (tuple, list)):
+        return len(value) * _nbytes(value[0]) if value else 0
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    return 0
+
+
+def _record(name, seconds, lib_seconds, nbytes):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = [0, 0.0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += lib_seconds
+        entry[3] += nbytes
+    for hook in list(_hooks):
+        hook(name, CallStats(1, seconds, lib_seconds, nbytes))
+
+
+def _timed_library(function):
+    """Return function, a library function, timed."""
+    name = function.__name__
+
+    def timed(*args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            seconds = time.perf_counter() - start
+            _local.lib = getattr(_local, 'lib', 0.0) + seconds
+            _record(name, seconds, seconds, 0)
+    return timed
+
+
+def _timed_public(function):
+    """Return function, a wrappers function, timed."""
+    name = function.__name__
+
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        outer = getattr(_local, 'lib', 0.0)
+        _local.lib = 0.0
+        nbytes = 0
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+            nbytes = _nbytes(result)
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            lib_seconds = _local.lib
+            _local.lib = outer + lib_seconds
+            _record(name, seconds, lib_seconds, nbytes)
+    return timed
+
+
+def enabled():
+    """Return True if instrumentation is enabled."""
+    return bool(_originals)
+
+
+def enable():
+    """Start timing wrappers calls, loading the library if needed.
+
+    Statistics are kept from earlier enabled periods, see `reset()`.
+
+    """
+    lib = wrappers.load_library()
+    with _lock:
+        if _originals:
+            return
+        namespace = vars(wrappers)
+        for key, value in list(namespace.items()):
+            if isinstance(value, lib._FuncPtr):
+                timed = _timed_library(value)
+            elif (isinstance(value, types.FunctionType)
+                  and value.__module__ == wrappers.__name__
+                  and not key.startswith('_') and key not in _EXCLUDED
+                  and not inspect.isgeneratorfunction(value)):
+                timed = _timed_public(value)
+            else:
+                continue
+            _originals[key] = value
+            namespace[key] = timed
+
+
+def disable():
+    """Stop timing, put the original functions back in wrappers."""
+    with _lock:
+        vars(wrappers).update(_originals)
+        _originals.clear()
+
+
+def stats():
+    """Return a dict function name --> `CallStats`, a snapshot."""
+    with _lock:
+        return {name: CallStats(*entry) for name, entry in _stats.items()}
+
+
+def reset():
+    """Clear the collected statistics."""
+    with _lock:
+        _stats.clear()
+
+
+def add_hook(hook):
+    """Call hook(name, call_stats) after each timed call.
+
+    call_stats is a `CallStats` of the one call, (calls is 1). Hooks
+    are called in the thread making the call and should be quick.
+
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Remove a hook added by `add_hook()`."""
+    _hooks.remove(hook)
@@ -0,0 +1,254 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Read Dewesoft data files in worker processes.
+
+DWDataReaderLib keeps one global opened file per process, so reading
+many files (or many channels of one big file) concurrently requires
+several processes. Each worker process in the pool initializes the
+library once and then opens and closes files as tasks arrive.
+
+`read_many()` reads many files, one file per task. `read_channels()`
+and `read_channel()` read one big file with several processes each
+opening the same file, reading disjoint channels or disjoint sample
+positions of one channel respectively.
+
+"""
+
+import os
+import itertools
+import multiprocessing
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import dwdat2py
+
+FileResult = namedtuple('FileResult', ('path', 'fileinfo', 'data'))
+FileResult.__doc__ = """Data read from one file by `read_many()`.
+
+path is the path as given, fileinfo is the `wrappers.FileInfo` from
+opening the file and data is a dict channel --> channel data, with the
+channels as given to `read_many()`.
+"""
+
+
+def _init_worker(libdir):
+    """Initialize the library once in a worker process."""
+    dwdat2py.DEWELIBDIR = libdir
+    from . import wrappers
+    wrappers.init()
+
+
+def _read_channel(wrappers, index, reduction, as_array, encoding):
+    """Return data for channel `index` in the opened file.
+
+    Full speed (time_stamp, data) if reduction is None, else the reduced
+    data as from `wrappers.channel_reduced()`.
+
+    """
+    if reduction is not None:
+        return wrappers.channel_reduced(index, reduction, encoding,
+                                        as_array=as_array)
+    array_size = wrappers.channel_catalog(encoding).by_index[index].array_size
+    count = wrappers.get_scaled_samples_count(index)
+    return wrappers.get_scaled_samples(index, 0, count, array_size,
+                                       as_array=as_array)
+
+
+def _read_file(path, channels, reduction, as_array, encoding, fsencoding):
+    """Open `path`, read `channels` and close it again."""
+    from . import wrappers
+    fileinfo = wrappers.open_data_file(path, fsencoding)
+    try:
+        data = {}
+        for channel in channels:
+            index = wrappers.channel_index(channel, encoding)
+            data[channel] = _read_channel(wrappers, index, reduction,
+                                          as_array, encoding)
+    finally:
+        wrappers.close_data_file()
+    return FileResult(path, fileinfo, data)
+
+
+def pool(workers=None):
+    """Return a process pool with the library initialized in each worker.
+
+    workers is the number of processes, see
+    `concurrent.futures.ProcessPoolExecutor`. The current
+    `dwdat2py.DEWELIBDIR` is used by the workers.
+
+    Workers are started with the "spawn" method so they do not inherit
+    the library state of this process, (forked workers fail to open a
+    file that is opened in the parent).
+
+    """
+    return ProcessPoolExecutor(workers,
+                               multiprocessing.get_context('spawn'),
+                               initializer=_init_worker,
+                               initargs=(dwdat2py.libdirfind(),))
+
+
+def read_many(paths, channels, reduction=None, workers=None, ordered=True,
+              as_array=False, encoding=None, fsencoding=None):
+    """Read `channels` from each file in `paths` using a process pool.
+
+    Yield a `FileResult` (path, fileinfo, data) per file as the files are
+    read. Files are distributed over `workers` processes, each running
+    its own library session.
+
+    paths : iterable
+        Names of the data files.
+
+    channels : sequence
+        Channel indexes or names (or long names) to read from each file.
+
+    reduction : int (or None)
+        If None, read full speed data, data[channel] is then
+        (time_stamp, data) as from `wrappers.get_scaled_samples()`.
+        Else data[channel] is reduced data as from
+        `wrappers.channel_reduced()` with this reduction.
+
+    workers : int (or None)
+        Number of worker processes, default is the number of CPUs.
+
+    ordered : bool
+        If True, results are yielded in the order of `paths`. If False
+        they are yielded as soon as they are complete.
+
+    At most 2 * workers files are submitted ahead of the results
+    yielded, so paths is consumed as the results are and memory use
+    does not grow with the number of files.
+
+    as_array : bool
+        Passed to the wrappers functions to get numpy arrays.
+
+    encoding, fsencoding
+        Passed to `wrappers.channel_catalog()` and
+        `wrappers.open_data_file()` respectively.
+
+    An exception raised while reading a file is raised here when its
+    result is due.
+
+    Example usage:
+
+    >>> from dwdat2py import parallel
+    >>> for res in parallel.read_many(paths, ['GPSvel'], reduction=1):
+    ...     print(res.path, max(res.data['GPSvel']))
+
+    """
+
+    args = (channels, reduction, as_array, encoding, fsencoding)
+    workers = workers or os.cpu_count() or 1
+    paths = iter(paths)
+    pending = deque()
+
+    def submit():
+        for path in itertools.islice(paths, 2 * workers - len(pending)):
+            pending.append(executor.submit(_read_file, path, *args))
+
+    with pool(workers) as executor:
+        try:
+            submit()
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    future = wait(pending,
+                                  return_when=FIRST_COMPLETED).done.pop()
+                    pending.remove(future)
+                result = future.result()
+                submit()
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _read_range(path, channel, position, count, as_array, encoding,
+                fsencoding):
+    """Return full speed data for `count` samples at `position`.
+
+    If count is None, return (count, array_size) of the channel instead.
+
+    """
+    from . import wrappers
+    wrappers.open_data_file(path, fsencoding)
+    try:
+        index = wrappers.channel_index(channel, encoding)
+        array_size = (wrappers.channel_catalog(encoding)
+                      .by_index[index].array_size)
+        if count is None:
+            return wrappers.get_scaled_samples_count(index), array_size
+        return wrappers.get_scaled_samples(index, position, count,
+                                           array_size, as_array=as_array)
+    finally:
+        wrappers.close_data_file()
+
+
+def read_channels(path, channels, reduction=None, workers=None,
+                  as_array=False, encoding=None, fsencoding=None):
+    """Read `channels` from one file, dividing the channels over processes.
+
+    Each of `workers` processes opens `path` and reads a disjoint
+    subset of `channels`. Return a dict channel --> channel data
+    assembled from all workers, with data as described for
+    `read_many()`, which see for the other arguments.
+
+    """
+
+    channels = list(channels)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(channels)))
+    args = (reduction, as_array, encoding, fsencoding)
+    with pool(workers) as executor:
+        futures = [executor.submit(_read_file, path, channels[i::workers],
+                                   *args)
+                   for i in range(workers)]
+        data = {}
+        for future in futures:
+            data.update(future.result().data)
+    return {channel: data[channel] for channel in channels}
+
+
+def read_channel(path, channel, workers=None, as_array=False,
+                 encoding=None, fsencoding=None):
+    """Read full speed data of one channel, dividing positions over processes.
+
+    Each of `workers` processes opens `path` and reads a disjoint range
+    of sample positions of `channel`. Return (time_stamp, data) like
+    `wrappers.get_scaled_samples()` for the whole channel, see
+    `read_many()` for the arguments.
+
+    """
+
+    workers = workers or os.cpu_count() or 1
+    args = (as_array, encoding, fsencoding)
+    with pool(workers) as executor:
+        count, array_size = executor.submit(_read_range, path, channel, 0,
+                                            None, *args).result()
+        step = -(-count // workers) or 1
+        futures = [executor.submit(_read_range, path, channel, position,
+                                   min(step, count - position), *args)
+                   for position in range(0, count, step)]
+        parts = [future.result() for future in futures]
+
+    if as_array:
+        import numpy as np
+        if not parts:
+            return (np.empty(0), np.empty((0, array_size)
+                                          if array_size > 1 else 0))
+        return (np.concatenate([part[0] for part in parts]),
+                np.concatenate([part[1] for part in parts]))
+    return (tuple(t for part in parts for t in part[0]),
+            tuple(v for part in parts for v in part[1]))
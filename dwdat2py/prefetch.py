@@ -0,0 +1,142 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Read channel data on a background thread while it is processed.
+
+ctypes releases the GIL during library calls, so reading the next
+chunk of a channel can run while the previous chunk is processed in
+Python. `iter_prefetched()` yields chunks like
+`wrappers.iter_scaled_samples()`, but the reads are done by one reader
+thread filling a small pool of buffers ahead of the consumer:
+
+>>> from dwdat2py import prefetch
+>>> for time, data in prefetch.iter_prefetched(0, as_array=True):
+...     process(time, data)
+
+The library has one opened file per process and is not meant to be
+called from several threads at once. Library calls of all prefetching
+readers are serialized by `READ_LOCK`, but other calls to `wrappers`
+functions while iterating must be made holding the lock too (or not at
+all). The iteration must be finished or closed before the data file is
+closed.
+
+"""
+
+import threading
+import queue
+import ctypes as ct
+
+from . import wrappers
+from . import DWDataReaderHeader as dh
+
+READ_LOCK = threading.Lock()
+"""Held by the reader threads around each library call."""
+
+_DONE = object()
+
+
+class _Buffers:
+    """One (time, data) pair of ctypes buffers for `chunk` samples."""
+
+    def __init__(self, chunk, array_size, as_array):
+        self.data = (ct.c_double * (chunk * array_size))()
+        self.time = (ct.c_double * chunk)()
+        if as_array:
+            np = wrappers.np
+            self.adata = np.ctypeslib.as_array(self.data).reshape(
+                chunk, array_size)
+            self.atime = np.ctypeslib.as_array(self.time)
+
+
+def _reader(ch_index, position, end, chunk, free, filled, stop):
+    """Fill buffers from free and put (buffers, n) on filled."""
+    try:
+        while position < end:
+            buffers = free.get()
+            if stop.is_set():
+                return
+            n = min(chunk, end - position)
+            with READ_LOCK:
+                stat = wrappers._get_scaled_samples(
+                    ch_index, position, n, buffers.data, buffers.time)
+            if stat != 0:
+                raise RuntimeError(dh.DWStatus(stat).name)
+            position += n
+            filled.put((buffers, n))
+    except BaseException as e:
+        filled.put((e, 0))
+    else:
+        filled.put((_DONE, 0))
+
+
+def iter_prefetched(ch_index, chunk=65536, array_size=1, position=0,
+                    count=None, depth=2, as_array=False):
+    """Yield "full speed" (time_stamp, data) for `ch_index` in chunks.
+
+    As `wrappers.iter_scaled_samples()`, which see for the arguments,
+    but the chunks are read by a background thread up to `depth`
+    chunks ahead of the consumer.
+
+    depth : int
+        Number of chunks read ahead. depth + 1 buffers of `chunk`
+        samples are allocated, depth 1 is double buffering.
+
+    With `as_array` True the yielded arrays are views on the buffers,
+    valid until the next chunk is requested. Copy them if they need to
+    be kept. Errors from the library are raised in the consumer.
+
+    Closing the generator early, (break out of the loop), stops the
+    reader thread and waits for it to finish an ongoing read.
+
+    """
+
+    if as_array:
+        wrappers._require_numpy()
+    if depth < 1:
+        raise ValueError('depth must be at least 1', depth)
+    if count is None:
+        with READ_LOCK:
+            count = wrappers.get_scaled_samples_count(ch_index) - position
+    chunk = max(1, min(chunk, count))
+
+    free = queue.Queue()
+    for _ in range(depth + 1):
+        free.put(_Buffers(chunk, array_size, as_array))
+    filled = queue.Queue()
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=_reader, name='dwdat2py-prefetch', daemon=True,
+        args=(ch_index, position, position + count, chunk, free, filled,
+              stop))
+    thread.start()
+
+    try:
+        while True:
+            buffers, n = filled.get()
+            if buffers is _DONE:
+                break
+            if isinstance(buffers, BaseException):
+                raise buffers
+            if as_array:
+                yield buffers.atime[:n], (buffers.adata[:n]
+                                          if array_size > 1
+                                          else buffers.adata[:n, 0])
+            else:
+                yield (tuple(buffers.time[:n]),
+                       tuple(buffers.data[:n * array_size]))
+            free.put(buffers)
+    finally:
+        stop.set()
+        free.put(None)              # wake the reader if waiting
+        thread.join()
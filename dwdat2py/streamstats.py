@@ -0,0 +1,273 @@
+# Copyright 2026 Tomas Nordin
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single pass statistics of full speed channel data.
+
+`channel_stats()` reads each channel once in chunks and returns, with
+memory independent of the length of the recording:
+
+- count, mean, standard deviation, skewness and kurtosis, the moments
+  combined chunk by chunk with the pairwise update formulas (Chan et
+  al., Pebay), which are numerically stable.
+
+- exact min and max with the time stamps of their first occurrence.
+
+- approximate quantiles from a `TDigest`, (a merging t-digest), more
+  accurate in the tails than in the middle.
+
+- histograms over fixed bin edges given beforehand.
+
+The accumulator `StreamStats` can also be fed chunks from elsewhere.
+The file must be opened with `wrappers.open_data_file()` (or
+`dwdat2py.wrappersimport()`). Requires numpy.
+
+>>> from dwdat2py import streamstats
+>>> stats = streamstats.channel_stats(['GPSvel', 'ENG_RPM'])
+>>> stats['GPSvel'].std, stats['GPSvel'].digest.quantile(0.99)
+
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from . import wrappers
+
+ChannelStats = namedtuple('ChannelStats',
+                          ('count', 'mean', 'std', 'skewness', 'kurtosis',
+                           'min', 'min_time', 'max', 'max_time', 'digest',
+                           'histogram'))
+ChannelStats.__doc__ = """Statistics of one channel, see `StreamStats`.
+
+std is the population standard deviation (ddof 0) and kurtosis the
+excess kurtosis. Moments not defined for the count (or zero variance)
+are nan, as are all values for no samples. digest is a `TDigest` and
+histogram a `Histogram` (or None).
+"""
+
+Histogram = namedtuple('Histogram', ('edges', 'counts', 'below', 'above'))
+Histogram.__doc__ = """Counts of values in bins given by edges.
+
+counts has one element less than edges. Bins are half open [a, b)
+except the last which includes its right edge, as for numpy.histogram.
+below and above are the counts of values outside the edges.
+"""
+
+
+class TDigest:
+    """Mergeable summary of a distribution for approximate quantiles.
+
+    Values are kept as centroids (mean, weight), sorted by mean. After
+    each update the centroids are compressed so that each spans at most
+    one unit on the scale k(q) = delta / (2 pi) * asin(2 q - 1), giving
+    small centroids near q = 0 and q = 1. The number of centroids is
+    at most about delta / 2.
+
+    """
+
+    def __init__(self, delta=100):
+        self.delta = delta
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        """Add values (with weights, default 1) to the digest."""
+        values = np.asarray(values, np.float64).ravel()
+        if len(values) == 0:
+            return
+        if weights is None:
+            weights = np.ones(len(values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate((self.means, values)),
+                       np.concatenate((self.weights, weights)))
+
+    def merge(self, other):
+        """Add the centroids of TDigest other to this digest."""
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate((self.means, other.means)),
+                           np.concatenate((self.weights, other.weights)))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        # centroid midpoints on the k scale, grouped by unit intervals
+        q = (cumulative - weights / 2) / total
+        k = self.delta / (2 * math.pi) * np.arcsin(2 * q - 1)
+        group = np.floor(k - k[0]).astype(np.intp)
+        starts = np.flatnonzero(np.diff(group, prepend=-1))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Return the approximate q quantile(s), 0 <= q <= 1.
+
+        Interpolated between the centroid means at their cumulative
+        weight midpoints, and the exact min and max at q 0 and 1. nan
+        if the digest is empty.
+
+        """
+        if len(self.means) == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        cumulative = np.cumsum(self.weights)
+        positions = (cumulative - self.weights / 2) / cumulative[-1]
+        positions = np.concatenate(([0.0], positions, [1.0]))
+        means = np.concatenate(([self.min], self.means, [self.max]))
+        return np.interp(q, positions, means)[()]
+
+
+class StreamStats:
+    """Accumulate statistics of chunks of one channel.
+
+    delta : int
+        Compression of the `TDigest`, higher is more accurate and uses
+        more memory.
+
+    edges : sequence (or None)
+        Histogram bin edges, increasing. No histogram if None.
+
+    """
+
+    def __init__(self, delta=100, edges=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = self.m3 = self.m4 = 0.0   # sums of powers of deviations
+        self.min = self.max = math.nan
+        self.min_time = self.max_time = math.nan
+        self.digest = TDigest(delta)
+        self.edges = None if edges is None else np.asarray(edges, float)
+        if self.edges is not None:
+            self.counts = np.zeros(len(self.edges) - 1, np.int64)
+            self.below = self.above = 0
+
+    def update(self, time, values):
+        """Add a chunk of (time_stamp, values) arrays."""
+        values = np.asarray(values, np.float64)
+        nb = len(values)
+        if nb == 0:
+            return
+        na, n = self.count, self.count + nb
+        mean_b = float(values.mean())
+        dev = values - mean_b
+        dev2 = dev * dev
+        m2b = float(dev2.sum())
+        m3b = float((dev2 * dev).sum())
+        m4b = float((dev2 * dev2).sum())
+        delta = mean_b - self.mean
+        m2a, m3a = self.m2, self.m3
+        self.m4 += (m4b + delta ** 4 * na * nb * (na * na - na * nb + nb * nb)
+                    / n ** 3
+                    + 6 * delta ** 2 * (na * na * m2b + nb * nb * m2a) / n ** 2
+                    + 4 * delta * (na * m3b - nb * m3a) / n)
+        self.m3 += (m3b + delta ** 3 * na * nb * (na - nb) / n ** 2
+                    + 3 * delta * (na * m2b - nb * m2a) / n)
+        self.m2 += m2b + delta ** 2 * na * nb / n
+        self.mean += delta * nb / n
+        self.count = n
+
+        lo, hi = int(values.argmin()), int(values.argmax())
+        if not values[lo] >= self.min:      # also if min is nan
+            self.min, self.min_time = float(values[lo]), float(time[lo])
+        if not values[hi] <= self.max:
+            self.max, self.max_time = float(values[hi]), float(time[hi])
+
+        self.digest.update(values)
+        if self.edges is not None:
+            self.counts += np.histogram(values, self.edges)[0]
+            self.below += int((values < self.edges[0]).sum())
+            self.above += int((values > self.edges[-1]).sum())
+
+    def result(self):
+        """Return the `ChannelStats` of the chunks so far."""
+        n = self.count
+        nan = math.nan
+        mean = self.mean if n else nan
+        std = math.sqrt(self.m2 / n) if n else nan
+        if n > 1 and self.m2 > 0:
+            skewness = math.sqrt(n) * self.m3 / self.m2 ** 1.5
+            kurtosis = n * self.m4 / self.m2 ** 2 - 3
+        else:
+            skewness = kurtosis = nan
+        histogram = None
+        if self.edges is not None:
+            histogram = Histogram(self.edges, self.counts.copy(), self.below,
+                                  self.above)
+        return ChannelStats(n, mean, std, skewness, kurtosis, self.min,
+                            self.min_time, self.max, self.max_time,
+                            self.digest, histogram)
+
+
+def channel_stats(channels, t0=None, t1=None, delta=100, edges=None,
+                  chunk=65536, encoding=None):
+    """Return a dict channel --> `ChannelStats` for `channels`.
+
+    Each channel is read once in chunks by
+    `wrappers.iter_scaled_samples()`, the statistics are updated chunk
+    by chunk.
+
+    channels : sequence
+        Channel indexes or names (not array channels).
+
+    t0, t1 : float (or None)
+        If either is given, only samples in the time window [t0, t1)
+        are used, (t0 default 0 and t1 default the end of the file).
+
+    delta : int
+        Compression of the quantile digests, see `TDigest`.
+
+    edges : sequence or dict (or None)
+        Histogram bin edges for all channels, or a dict channel -->
+        edges for some of them. No histograms if None.
+
+    chunk : int
+        Number of samples read at a time.
+
+    encoding : str
+        Passed to `wrappers.channel_index()`.
+
+    """
+
+    catalog = wrappers.channel_catalog(encoding)
+    result = {}
+    for channel in channels:
+        index = wrappers.channel_index(channel, encoding)
+        if catalog.by_index[index].array_size != 1:
+            raise ValueError('no stats for array channel', channel)
+        if isinstance(edges, dict):
+            channel_edges = edges.get(channel)
+        else:
+            channel_edges = edges
+        position, count = 0, None
+        if t0 is not None or t1 is not None:
+            end = wrappers.file_info().duration if t1 is None else t1
+            position, count = wrappers.window_positions(
+                index, t0 or 0.0, end, encoding)
+        stats = StreamStats(delta, channel_edges)
+        for time, data in wrappers.iter_scaled_samples(
+                index, chunk, position=position, count=count,
+                as_array=True):
+            stats.update(time, data)
+        result[channel] = stats.result()
+    return result
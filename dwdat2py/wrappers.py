@@ -20,6 +20,10 @@ http://www.dewesoft.com/developers (need an account) and set an
 environment variable `DEWELIBDIR` to the directory in which the binary
 library file(s) are stored.
 
+The library is loaded at the first call of a function using it (see
+`load_library()`), and numpy at the first call asking for array
+output, so importing this module is cheap.
+
 This module should be used with some care. Here is a typical work flow:
 
 1.    `init()`
@@ -36,26 +40,154 @@ This module should be used with some care. Here is a typical work flow:
 
 import ctypes as ct
 import os
-import platform
+import sys
+import threading
 from collections import namedtuple
 import locale
+import math
 from operator import attrgetter
 
 from . import DWDataReaderHeader as dh
 from . import libdirfind
 
-libdir = libdirfind()
+np = None                       # numpy, imported by _require_numpy
+
+libdir = None                   # set by load_library
+libname = None
+_lib_lock = threading.Lock()
+
+
+class _LazyFunction:
+    """A library function prototype, resolved when the library loads.
+
+    argtypes and restype set on the prototype are set on the library
+    function by `load_library()`, which also replaces the prototype by
+    the library function in the module namespace. Only a first call
+    goes through the prototype.
+
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.function = None
+
+    def __call__(self, *args):
+        if self.function is None:
+            load_library()
+        return self.function(*args)
+
+
+class _LazyLibrary:
+    """Stand-in for the library, giving `_LazyFunction` prototypes."""
+
+    def __getattr__(self, name):
+        return _LazyFunction(name)
+
+
+_lib = _LazyLibrary()
+
 
-libname = os.path.join(libdir, 'DWDataReaderLib')
-if platform.architecture()[0] == '64bit':
-    libname += '64'
-if platform.system() == 'Linux':
-    libname += '.so'
+def load_library():
+    """Load the shared library unless already loaded, return it.
 
-libname = os.path.abspath(libname)
-assert(os.path.exists(libname) or os.path.exists(libname + '.dll'))
+    The library is found in the directory given by `libdirfind()`, so
+    `dwdat2py.DEWELIBDIR` can be set any time before the first call of
+    a function using the library. Loading happens at that first call,
+    importing this module does not load the library. Safe to call from
+    several threads.
 
-_lib = ct.cdll.LoadLibrary(libname)
+    Wraps:
+        Nothing explicit. Loads the library with ctypes.
+
+    """
+
+    global _lib, libdir, libname
+    with _lib_lock:
+        if not isinstance(_lib, _LazyLibrary):
+            return _lib
+
+        directory = libdirfind()
+        name = os.path.join(directory, 'DWDataReaderLib')
+        if ct.sizeof(ct.c_void_p) == 8:
+            name += '64'
+        if sys.platform.startswith('linux'):
+            name += '.so'
+        name = os.path.abspath(name)
+        assert(os.path.exists(name) or os.path.exists(name + '.dll'))
+        lib = ct.cdll.LoadLibrary(name)
+
+        namespace = globals()
+        for key, value in list(namespace.items()):
+            if isinstance(value, _LazyFunction):
+                function = getattr(lib, value.name)
+                for attr in ('argtypes', 'restype'):
+                    if attr in vars(value):
+                        setattr(function, attr, vars(value)[attr])
+                value.function = function
+                namespace[key] = function
+        libdir, libname, _lib = directory, name, lib
+        return lib
+
+
+def _require_numpy():
+    """Import numpy on first use, raise ImportError if not available."""
+    global np, REDUCED_DTYPE
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('numpy is required for array output, '
+                              'install it or use the tuple/list output') \
+                from None
+        # numpy dtype matching the packed DWReducedValue structure
+        REDUCED_DTYPE = numpy.dtype(
+            [(name, numpy.float64) for name, _ in dh.DWReducedValue._fields_])
+        np = numpy
+
+
+def __getattr__(name):
+    # REDUCED_DTYPE is made when numpy is imported, None without numpy
+    if name == 'REDUCED_DTYPE':
+        try:
+            _require_numpy()
+        except ImportError:
+            return None
+        return REDUCED_DTYPE
+    raise AttributeError('module {!r} has no attribute {!r}'
+                         .format(__name__, name))
+
+
+# buffer item formats accepted for output buffers of doubles, byte
+# formats are taken as raw memory
+_DOUBLE_FORMATS = {'d', '<d', '=d', '@d'}
+_BYTE_FORMATS = {'B', 'b', 'c'}
+
+
+def _out_buffer(obj, ctype, count, name, formats=_DOUBLE_FORMATS):
+    """Return a ctypes array of `count` ctype sharing memory with obj.
+
+    obj is a caller supplied output buffer, any writable C-contiguous
+    object supporting the buffer protocol with an item format in
+    formats (or bytes) and room for count ctype. Raise TypeError or
+    ValueError naming the argument `name` if not.
+
+    """
+    try:
+        view = memoryview(obj)
+    except TypeError:
+        raise TypeError(name, 'does not support the buffer protocol') \
+            from None
+    with view:
+        if view.readonly:
+            raise ValueError(name, 'is read-only')
+        if not view.c_contiguous:
+            raise ValueError(name, 'is not C-contiguous')
+        if view.format not in formats and view.format not in _BYTE_FORMATS:
+            raise ValueError(name, 'has wrong item format', view.format)
+        if view.nbytes < count * ct.sizeof(ctype):
+            raise ValueError(name, 'too small, need bytes',
+                             count * ct.sizeof(ctype), view.nbytes)
+    return (ctype * count).from_buffer(obj)
 
 # --------------------------------------------------------------------
 
@@ -139,11 +271,28 @@ def open_data_file(filename, fsencoding=None):
         else:
             filename = os.fsencode(filename)
 
+    _file_state.clear()
     stat = _open_data_file(filename, ct.byref(info))
     if stat != 0:
         raise RuntimeError(dh.DWStatus(stat).name)
 
-    return FileInfo(info.sample_rate, info.start_store_time, info.duration)
+    fileinfo = FileInfo(info.sample_rate, info.start_store_time,
+                        info.duration)
+    _file_state['fileinfo'] = fileinfo
+    return fileinfo
+
+
+def file_info():
+    """Return the FileInfo of the opened file.
+
+    Return None if no file is opened by `open_data_file()`.
+
+    Wraps:
+        Nothing explicit. Return the FileInfo kept from
+        `open_data_file()`.
+
+    """
+    return _file_state.get('fileinfo')
 
 # --------------------------------------------------------------------
 
@@ -156,6 +305,7 @@ def close_data_file():
 
     Wraps:
         DWStatus DWCloseDataFile();"""
+    _file_state.clear()
     return _close_data_file()
 
 # --------------------------------------------------------------------
@@ -222,15 +372,28 @@ _get_channel_factors = _lib.DWGetChannelFactors
 _get_channel_factors.argtypes = (ct.c_int, ct.POINTER(ct.c_double),
                                  ct.POINTER(ct.c_double))
 _get_channel_factors.restype = ct.c_int
-def get_channel_factors(ch_index):
+def get_channel_factors(ch_index, out=None):
     """
     Return channel scale and offset as (scale, offset).
 
+    out : buffer (or None)
+        If given, a writable buffer of (at least) two doubles, (numpy
+        float64 array, array.array('d'), bytearray...). scale and
+        offset are written to it and `out` is returned instead of a
+        tuple.
+
     Wraps
         DWStatus DWGetChannelFactors(int ch_index, double* scale,
                                      double* offset);
 
     """
+    if out is not None:
+        factors = _out_buffer(out, ct.c_double, 2, 'out')
+        offset = ct.c_double.from_buffer(factors, ct.sizeof(ct.c_double))
+        stat = _get_channel_factors(ch_index, factors, ct.byref(offset))
+        if stat != 0:
+            raise RuntimeError(dh.DWStatus(stat).name)
+        return out
     scale, offset = ct.c_double(), ct.c_double()
     stat = _get_channel_factors(ch_index, ct.byref(scale), ct.byref(offset))
     if stat != 0:
@@ -247,12 +410,12 @@ def get_channel_props(ch_index, ch_prop, encoding=None):
     """Return the property specifed by `ch_prop`.
 
     `ch_prop` shall be one of the integers listed below. It is not
-    necessary to make preparatory calls to length variants. The two last
+    necessary to make preparatory calls to length variants. The two
     "commented" options are not supported by this function.
 
     `encoding` is used to decode the bytes returned from the wrapped
-    function when `ch_prop` is 7 or 9. `locale.getpreferredencoding()`
-    is used as a default.
+    function when `ch_prop` is 7, 9 or 13.
+    `locale.getpreferredencoding()` is used as a default.
 
     DW_DATA_TYPE = 0,            # get data type
     DW_DATA_TYPE_LEN_BYTES = 1,  # get length of data type in bytes
@@ -267,6 +430,8 @@ def get_channel_props(ch_index, ch_prop, encoding=None):
     DW_CH_XMLPROPS_LEN = 10,     # get length of channel XML properties
     # DW_CH_CUSTOMPROPS = 11,      # get channel XML custom properties
     # DW_CH_CUSTOMPROPS_COUNT = 12 # get length of channel XML custom
+    DW_CH_LONGNAME = 13,         # get channel long name
+    DW_CH_LONGNAME_LEN = 14,     # get length of channel long name
 
     Wraps
         DWStatus DWGetChannelProps(int ch_index, enum DWChannelProps ch_prop,
@@ -281,7 +446,7 @@ def get_channel_props(ch_index, ch_prop, encoding=None):
     pbuffer = ct.create_string_buffer(maxlen.value)
     encoding = encoding or locale.getpreferredencoding()
 
-    if p.value in (0, 1, 2, 3, 4, 8, 10):  # int return types
+    if p.value in (0, 1, 2, 3, 4, 8, 10, 14):  # int return types
         stat = _get_channel_props(ch_index, p.value, pbuffer,
                                   ct.byref(maxlen))
         if stat != 0:
@@ -315,8 +480,9 @@ def get_channel_props(ch_index, ch_prop, encoding=None):
 
         return pbuffer.value.decode(encoding)
 
-    elif p.value == 9:     # char buffer (xml) return type
-        stat = _get_channel_props(ch_index, 10, pbuffer, ct.byref(maxlen))
+    elif p.value in (9, 13):  # char buffer (xml, long name) return type
+        stat = _get_channel_props(ch_index, p.value + 1, pbuffer,
+                                  ct.byref(maxlen))
         if stat != 0:
             raise RuntimeError(dh.DWStatus(stat).name)
 
@@ -335,6 +501,100 @@ def get_channel_props(ch_index, ch_prop, encoding=None):
 
 # --------------------------------------------------------------------
 
+
+class ChannelCatalog:
+    """Lookup tables for the channels of the opened data file.
+
+    Get one with `channel_catalog()` rather than creating it directly.
+
+    channels : list
+        The `Channel` namedtuples as returned by `get_channel_list()`.
+
+    by_index : dict
+        Channel index --> `Channel`.
+
+    by_name : dict
+        Channel name --> channel index, the first channel in list order
+        if names are repeated (as for long names).
+
+    long_names : dict
+        Channel index --> channel long name (DW_CH_LONGNAME).
+
+    """
+
+    def __init__(self, channels, long_names):
+        self.channels = channels
+        self.by_index = {ch.index: ch for ch in channels}
+        self.by_name = {}
+        for ch in channels:
+            self.by_name.setdefault(ch.name, ch.index)
+        self.long_names = long_names
+        self._by_long_name = {}
+        for index, name in long_names.items():
+            self._by_long_name.setdefault(name, index)
+
+    def index(self, channel):
+        """Return the index of `channel`, given as index, name or long name.
+
+        Raise ValueError if not found.
+
+        """
+        if type(channel) is int:
+            if channel in self.by_index:
+                return channel
+        elif channel in self.by_name:
+            return self.by_name[channel]
+        elif channel in self._by_long_name:
+            return self._by_long_name[channel]
+        raise ValueError(channel, 'not found in data')
+
+
+# State cached for the opened file, cleared by open_data_file() and
+# close_data_file(). Keys are 'fileinfo' (FileInfo), 'catalogs'
+# (encoding --> ChannelCatalog) and 'time_probes' (channel index -->
+# {position: time_stamp}).
+_file_state = {}
+
+
+def channel_catalog(encoding=None):
+    """Return a `ChannelCatalog` for the opened data file.
+
+    The catalog is built on first call after `open_data_file()` and
+    then reused until the file is closed, (one catalog per
+    `encoding`, which is passed to `get_channel_list()`).
+
+    Wraps:
+        Nothing explicit. Support function caching the result of
+        DWGetChannelList and DWGetChannelProps (DW_CH_LONGNAME).
+
+    """
+
+    encoding = encoding or locale.getpreferredencoding()
+    catalogs = _file_state.setdefault('catalogs', {})
+    if encoding not in catalogs:
+        channels = get_channel_list(encoding)
+        longname = dh.DWChannelProps.DW_CH_LONGNAME.value
+        long_names = {ch.index: get_channel_props(ch.index, longname,
+                                                  encoding)
+                      for ch in channels}
+        catalogs[encoding] = ChannelCatalog(channels, long_names)
+    return catalogs[encoding]
+
+
+def channel_index(channel, encoding=None):
+    """Return the index of `channel` given as index, name or long name.
+
+    A channel given as int is returned as is without lookup. Names are
+    resolved with `channel_catalog(encoding)`. Raise ValueError if the
+    name is not found.
+
+    """
+    if type(channel) is int:
+        return channel
+    return channel_catalog(encoding).index(channel)
+
+# --------------------------------------------------------------------
+
 _get_scaled_samples_count = _lib.DWGetScaledSamplesCount
 _get_scaled_samples_count.argtypes = (ct.c_int,)
 _get_scaled_samples_count.restype = ct.c_longlong
@@ -369,7 +629,8 @@ _get_scaled_samples.argtypes = (ct.c_int, ct.c_longlong, ct.c_int,
                                 ct.POINTER(ct.c_double),
                                 ct.POINTER(ct.c_double))
 _get_scaled_samples.restype = ct.c_int
-def get_scaled_samples(ch_index, position, count, array_size=1):
+def get_scaled_samples(ch_index, position, count, array_size=1,
+                       as_array=False, out=None, time_out=None):
     """Return "full speed" (time_stamp, data) for channel `ch_index`.
 
     ch_index : int
@@ -386,6 +647,22 @@ def get_scaled_samples(ch_index, position, count, array_size=1):
         (Channel.array_size). This shall be 1 if the channel is not an
         array channel.
 
+    as_array : bool
+        If True, return numpy arrays instead of tuples. The arrays
+        share memory with the buffers filled by the library, no copy
+        is made. data is a 2-D view shaped (count, array_size) if
+        `array_size` > 1, else 1-D. Requires numpy.
+
+    out, time_out : buffer (or None)
+        Writable C-contiguous buffers of doubles (numpy float64 arrays,
+        array.array('d'), bytearray or any object supporting the buffer
+        protocol) to fill with data and time stamps, instead of
+        allocating new ones. out needs room for count * array_size
+        values and time_out for count values, larger buffers are
+        filled from the start. A given buffer is returned as is in
+        place of data or time_stamp, so reading in a loop into the
+        same buffers allocates no sample memory.
+
     Wraps
         DWStatus DWGetScaledSamples(int ch_index, __int64 position,
                                     int count, double* data,
@@ -416,12 +693,375 @@ def get_scaled_samples(ch_index, position, count, array_size=1):
 
     """
 
-    data = (ct.c_double * (count * array_size))()  # (c_double_Array_...)
-    time = (ct.c_double * (count))()
+    if as_array:
+        _require_numpy()
+    if out is None:
+        data = (ct.c_double * (count * array_size))()  # (c_double_Array_...)
+    else:
+        data = _out_buffer(out, ct.c_double, count * array_size, 'out')
+    if time_out is None:
+        time = (ct.c_double * (count))()
+    else:
+        time = _out_buffer(time_out, ct.c_double, count, 'time_out')
     stat = _get_scaled_samples(ch_index, position, count, data, time)
     if stat != 0:
         raise RuntimeError(dh.DWStatus(stat).name)
-    return tuple(time), tuple(data)
+    if out is None:
+        out = np.ctypeslib.as_array(data) if as_array else tuple(data)
+        if as_array and array_size > 1:
+            out = out.reshape(count, array_size)
+    if time_out is None:
+        time_out = np.ctypeslib.as_array(time) if as_array else tuple(time)
+    return time_out, out
+
+# --------------------------------------------------------------------
+
+
+def iter_scaled_samples(ch_index, chunk=65536, array_size=1, position=0,
+                        count=None, as_array=False):
+    """Yield "full speed" (time_stamp, data) for `ch_index` in chunks.
+
+    Each yielded item is like the return value of
+    `get_scaled_samples()` for at most `chunk` samples. The same two
+    buffers are used for all chunks so memory use is bounded by `chunk`
+    regardless of the channel length.
+
+    ch_index : int
+        The channel enumeration.
+
+    chunk : int
+        Maximum number of samples (arrays for array channels) per
+        chunk.
+
+    array_size : int
+        As for `get_scaled_samples()`.
+
+    position : int
+        Offset position of the first sample to read.
+
+    count : int (or None)
+        Number of samples to read in total. Read to the end of the
+        channel if None.
+
+    as_array : bool
+        If True, yield numpy arrays as described for
+        `get_scaled_samples()`. The arrays are views on the reused
+        buffers and are overwritten by the next chunk, copy them if
+        they need to be kept.
+
+    Wraps:
+        Nothing explicit. Support function calling DWGetScaledSamples
+        repeatedly with advancing position.
+
+    """
+
+    if as_array:
+        _require_numpy()
+    if count is None:
+        count = get_scaled_samples_count(ch_index) - position
+    chunk = max(1, min(chunk, count))
+    data = (ct.c_double * (chunk * array_size))()
+    time = (ct.c_double * chunk)()
+    if as_array:
+        adata = np.ctypeslib.as_array(data).reshape(chunk, array_size)
+        atime = np.ctypeslib.as_array(time)
+
+    end = position + count
+    while position < end:
+        n = min(chunk, end - position)
+        stat = _get_scaled_samples(ch_index, position, n, data, time)
+        if stat != 0:
+            raise RuntimeError(dh.DWStatus(stat).name)
+        position += n
+        if as_array:
+            yield atime[:n], (adata[:n] if array_size > 1
+                              else adata[:n, 0])
+        else:
+            yield tuple(time[:n]), tuple(data[:n * array_size])
+
+# --------------------------------------------------------------------
+
+_get_raw_samples_count = _lib.DWGetRawSamplesCount
+_get_raw_samples_count.argtypes = (ct.c_int,)
+_get_raw_samples_count.restype = ct.c_longlong
+def get_raw_samples_count(ch_index):
+    """Return the number of raw samples for channel with given index.
+
+    Wraps
+        __int64 DWGetRawSamplesCount(int ch_index);
+
+    """
+
+    return _get_raw_samples_count(ch_index)
+
+# --------------------------------------------------------------------
+
+# ctypes type of a raw sample by DWDataType value
+RAW_CTYPES = {
+    dh.DWDataType.dtByte.value: ct.c_uint8,
+    dh.DWDataType.dtShortInt.value: ct.c_int8,
+    dh.DWDataType.dtSmallInt.value: ct.c_int16,
+    dh.DWDataType.dtWord.value: ct.c_uint16,
+    dh.DWDataType.dtInteger.value: ct.c_int32,
+    dh.DWDataType.dtSingle.value: ct.c_float,
+    dh.DWDataType.dtInt64.value: ct.c_int64,
+    dh.DWDataType.dtDouble.value: ct.c_double,
+    dh.DWDataType.dtLongword.value: ct.c_uint32,
+}
+
+
+class RawSamples(namedtuple('RawSamples',
+                            ('time_stamp', 'data', 'scale', 'offset'))):
+    """Raw samples with the factors needed to scale them.
+
+    `data` is kept in the native type of the channel, call `scaled()`
+    to get the scaled values.
+
+    """
+
+    __slots__ = ()
+
+    def scaled(self):
+        """Return data scaled as data * scale + offset.
+
+        A numpy float64 array if data is a numpy array, else a tuple.
+
+        """
+        if np is not None and isinstance(self.data, np.ndarray):
+            return self.data * self.scale + self.offset
+        return tuple(v * self.scale + self.offset for v in self.data)
+
+
+_get_raw_samples = _lib.DWGetRawSamples
+_get_raw_samples.argtypes = (ct.c_int, ct.c_longlong, ct.c_int,
+                             ct.c_void_p, ct.POINTER(ct.c_double))
+_get_raw_samples.restype = ct.c_int
+def get_raw_samples(ch_index, position, count, array_size=1,
+                    data_type=None, as_array=False):
+    """Return raw (unscaled) samples for channel `ch_index`.
+
+    Return a `RawSamples` namedtuple (time_stamp, data, scale, offset).
+    data is in the native type of the channel (for example 16-bit
+    integers for a dtSmallInt channel) instead of being converted to
+    doubles, scale and offset are from `get_channel_factors()`.
+
+    ch_index, position, count, array_size, as_array
+        As for `get_scaled_samples()`.
+
+    data_type : int (or None)
+        The channel data type (Channel.data_type), one of the keys in
+        `RAW_CTYPES`. Looked up with `get_channel_props()` if None.
+        ValueError is raised for data types without a fixed size
+        numeric representation.
+
+    Wraps
+        DWStatus DWGetRawSamples(int ch_index, __int64 position,
+                                 int count, void* data,
+                                 double* time_stamp);
+
+    Note
+        The library does not provide raw samples for all channels,
+        (channels decoded from CAN messages have been seen to return
+        zeros). Compare with `get_scaled_samples()` if unsure.
+
+    """
+
+    if as_array:
+        _require_numpy()
+    if data_type is None:
+        data_type = get_channel_props(ch_index,
+                                      dh.DWChannelProps.DW_DATA_TYPE.value)
+    try:
+        ctype = RAW_CTYPES[data_type]
+    except KeyError:
+        raise ValueError('no raw sample support for data type',
+                         dh.DWDataType(data_type).name) from None
+
+    data = (ctype * (count * array_size))()
+    time = (ct.c_double * count)()
+    stat = _get_raw_samples(ch_index, position, count, data, time)
+    if stat != 0:
+        raise RuntimeError(dh.DWStatus(stat).name)
+    scale, offset = get_channel_factors(ch_index)
+    if as_array:
+        data = np.ctypeslib.as_array(data)
+        if array_size > 1:
+            data = data.reshape(count, array_size)
+        return RawSamples(np.ctypeslib.as_array(time), data, scale, offset)
+    return RawSamples(tuple(time), tuple(data), scale, offset)
+
+# --------------------------------------------------------------------
+
+_get_binary_samples_count = _lib.DWGetBinarySamplesCount
+_get_binary_samples_count.argtypes = (ct.c_int,)
+_get_binary_samples_count.restype = ct.c_longlong
+def get_binary_samples_count(ch_index):
+    """Return the number of samples in binary channel `ch_index`.
+
+    Wraps
+        __int64 DWGetBinarySamplesCount(int ch_index);
+
+    """
+
+    return _get_binary_samples_count(ch_index)
+
+# --------------------------------------------------------------------
+
+BinarySamples = namedtuple('BinarySamples',
+                           ('time_stamp', 'offsets', 'data'))
+BinarySamples.__doc__ = """Samples of a binary channel.
+
+All sample bytes are concatenated in `data`, sample n is
+data[offsets[n]:offsets[n + 1]] with time stamp time_stamp[n].
+"""
+
+# Bytes per sample (without the length prefix) of the structures of
+# binary data types, by DWDataType value. Other binary channels are
+# sized by DW_DATA_TYPE_LEN_BYTES.
+BINARY_SAMPLE_SIZES = {
+    dh.DWDataType.dtCANPortData.value: ct.sizeof(dh.DWCANPortData),
+    dh.DWDataType.dtCANFDPortData.value: ct.sizeof(dh.DWCANFDPortData),
+}
+
+
+def parse_binary_records(buffer, count, as_array=False, nbytes=None):
+    """Split `count` length prefixed records in `buffer`.
+
+    Each record in `buffer` (bytes-like) is an int with the record
+    length followed by that many bytes, as returned by
+    DWGetBinarySamplesEx. Return (offsets, data) where data is the
+    record bytes concatenated and offsets has count + 1 elements so
+    that record n is data[offsets[n]:offsets[n + 1]].
+
+    If `nbytes` is given only the first nbytes of buffer are parsed,
+    (the bytes retrieved by the library). ValueError is raised if the
+    records do not fit or a length is negative.
+
+    If `as_array` is True offsets and data are numpy arrays (int64 and
+    uint8). Records of equal length, (the common case for CAN
+    channels), are then split without a loop over the records. Else
+    offsets is a tuple and data bytes.
+
+    """
+
+    isize = ct.sizeof(ct.c_int)
+    view = memoryview(buffer).cast('B')
+    if nbytes is not None:
+        view = view[:nbytes]
+
+    if as_array:
+        _require_numpy()
+        raw = np.frombuffer(view, np.uint8)
+        if count == 0:
+            return np.zeros(1, np.int64), raw[:0].copy()
+        length = -1
+        if len(raw) >= isize:
+            length = int(raw[:isize].view(np.intc)[0])
+        stride = isize + length
+        if length >= 0 and count * stride <= len(raw):
+            records = raw[:count * stride].reshape(count, stride)
+            lengths = records[:, :isize].copy().view(np.intc)[:, 0]
+            # equal lengths at every stride is the only consistent parse
+            if (lengths == length).all():
+                offsets = np.arange(count + 1, dtype=np.int64) * length
+                return offsets, records[:, isize:].flatten()
+
+    starts = []
+    position = 0
+    for _ in range(count):
+        if position + isize > len(view):
+            raise ValueError('binary records exceed buffer')
+        length = view[position:position + isize].cast('i')[0]
+        if length < 0:
+            raise ValueError('negative binary record length', length)
+        starts.append((position + isize, length))
+        position += isize + length
+    if position > len(view):
+        raise ValueError('binary records exceed buffer')
+
+    if as_array:
+        lengths = np.array([length for _, length in starts], np.int64)
+        offsets = np.zeros(count + 1, np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        first = np.array([start for start, _ in starts], np.int64)
+        index = (np.repeat(first - offsets[:-1], lengths)
+                 + np.arange(offsets[-1]))
+        return offsets, raw[index]
+
+    offsets = [0]
+    for _, length in starts:
+        offsets.append(offsets[-1] + length)
+    return (tuple(offsets),
+            b''.join(view[start:start + length] for start, length in starts))
+
+
+_get_binary_samples_ex = _lib.DWGetBinarySamplesEx
+_get_binary_samples_ex.argtypes = (ct.c_int, ct.c_longlong, ct.c_int,
+                                   ct.c_char_p, ct.POINTER(ct.c_double),
+                                   ct.POINTER(ct.c_int))
+_get_binary_samples_ex.restype = ct.c_int
+def get_binary_samples(ch_index, position, count, max_sample_size=None,
+                       data_type=None, as_array=False):
+    """Return `count` samples from binary channel `ch_index`.
+
+    Return a `BinarySamples` namedtuple (time_stamp, offsets, data),
+    all samples read in one library call. See `parse_binary_records()`
+    for offsets and data.
+
+    ch_index, position, count
+        As for `get_scaled_samples()`.
+
+    max_sample_size : int (or None)
+        Maximum number of bytes in one sample, used to allocate the
+        buffer. If None it is the size in `BINARY_SAMPLE_SIZES` by
+        `data_type` or the DW_DATA_TYPE_LEN_BYTES property of the
+        channel, whichever is larger. ValueError is raised if neither
+        is known, then max_sample_size must be given.
+
+    data_type : int (or None)
+        The channel data type (Channel.data_type), looked up with
+        `get_channel_props()` if needed and None.
+
+    as_array : bool
+        If True, time_stamp, offsets and data are numpy arrays.
+
+    Wraps
+        DWStatus DWGetBinarySamplesEx(int ch_index, __int64 sampleIndex,
+                                      int count, char* data,
+                                      double* time_stamp, int* datalen);
+
+    """
+
+    if as_array:
+        _require_numpy()
+    if max_sample_size is None:
+        if data_type is None:
+            data_type = get_channel_props(
+                ch_index, dh.DWChannelProps.DW_DATA_TYPE.value)
+        max_sample_size = max(
+            BINARY_SAMPLE_SIZES.get(data_type, 0),
+            get_channel_props(
+                ch_index, dh.DWChannelProps.DW_DATA_TYPE_LEN_BYTES.value))
+        if max_sample_size <= 0:
+            raise ValueError('sample size not known, give max_sample_size',
+                             ch_index)
+
+    size = count * (ct.sizeof(ct.c_int) + max_sample_size)
+    data = ct.create_string_buffer(size)
+    time = (ct.c_double * count)()
+    datalen = ct.c_int()
+    stat = _get_binary_samples_ex(ch_index, position, count, data, time,
+                                  ct.byref(datalen))
+    if stat != 0:
+        raise RuntimeError(dh.DWStatus(stat).name)
+    if not 0 <= datalen.value <= size:
+        raise RuntimeError('binary samples exceed buffer', datalen.value,
+                           size)
+    offsets, payload = parse_binary_records(data, count, as_array,
+                                            datalen.value)
+    if as_array:
+        return BinarySamples(np.ctypeslib.as_array(time), offsets, payload)
+    return BinarySamples(tuple(time), offsets, payload)
 
 # --------------------------------------------------------------------
 
@@ -449,30 +1089,107 @@ def get_reduced_values_count(ch_index):
 
 # --------------------------------------------------------------------
 
+# output buffer formats for reduced records, doubles or REDUCED_DTYPE
+_REDUCED_FORMATS = _DOUBLE_FORMATS | {'T{' + ''.join(
+    'd:{}:'.format(name) for name, _ in dh.DWReducedValue._fields_) + '}'}
+
 _get_reduced_values = _lib.DWGetReducedValues
 _get_reduced_values.argtypes = (ct.c_int, ct.c_int, ct.c_int,
                                 ct.POINTER(dh.DWReducedValue))
 _get_reduced_values.restype = ct.c_int
-def get_reduced_values(ch_index, position, count):
+def get_reduced_values(ch_index, position, count, as_array=False,
+                       out=None):
     """Get channel reduced data.
 
     Data records are (time_stamp, ave, min, max, rms), starting at
     position position with the count count.
 
+    If `as_array` is True, return a numpy structured array of dtype
+    `REDUCED_DTYPE` (fields time_stamp, ave, min, max and rms) sharing
+    memory with the buffer filled by the library, instead of a list of
+    tuples.
+
+    If `out` is given, it is a writable C-contiguous buffer with room
+    for (at least) count records, a numpy array of dtype
+    `REDUCED_DTYPE` or a buffer of doubles (5 per record) or bytes. The
+    records are written to it and `out` is returned as is.
+
     Wraps:
         DWStatus DWGetReducedValues(int ch_index, int position,
                                     int count, struct DWReducedValue* data);
 
     """
 
-    data = (dh.DWReducedValue * count)()
+    if as_array:
+        _require_numpy()
+    if out is None:
+        data = (dh.DWReducedValue * count)()
+    else:
+        data = _out_buffer(out, dh.DWReducedValue, count, 'out',
+                           _REDUCED_FORMATS)
     stat = _get_reduced_values(ch_index, position, count, data)
     if stat != 0:
         raise RuntimeError(dh.DWStatus(stat).name)
+    if out is not None:
+        return out
+    if as_array:
+        return np.frombuffer(data, REDUCED_DTYPE)
     return [(v.time_stamp, v.ave, v.min, v.max, v.rms) for v in data]
 
 # --------------------------------------------------------------------
 
+_get_reduced_values_block = _lib.DWGetReducedValuesBlock
+_get_reduced_values_block.argtypes = (ct.POINTER(ct.c_int), ct.c_int,
+                                      ct.c_int, ct.c_int, ct.c_int,
+                                      ct.POINTER(dh.DWReducedValue))
+_get_reduced_values_block.restype = ct.c_int
+def get_reduced_values_block(ch_indexes, position, count, ib_level=0,
+                             as_array=False):
+    """Get reduced data for several channels in one call.
+
+    Return a list with one list of records (time_stamp, ave, min, max,
+    rms) per channel in `ch_indexes`, like `get_reduced_values()` would
+    for each channel. If `as_array` is True, return a numpy structured
+    array of dtype `REDUCED_DTYPE` shaped (len(ch_indexes), count)
+    instead, sharing memory with the buffer filled by the library.
+
+    ch_indexes : sequence of int
+        The channel indexes.
+
+    position, count : int
+        As for `get_reduced_values()`. Records past the end of a
+        channel are zero.
+
+    ib_level : int
+        The intermediate buffer level. 0 is the level with the block
+        size reported by `get_reduced_values_count()`, higher levels
+        have larger blocks. All channels need to have a matching first
+        ib level.
+
+    Wraps:
+        DWStatus DWGetReducedValuesBlock(int* ch_ids, int ch_count,
+                                         int position, int count,
+                                         int ib_level,
+                                         struct DWReducedValue* data);
+
+    """
+
+    if as_array:
+        _require_numpy()
+    ch_count = len(ch_indexes)
+    ch_ids = (ct.c_int * ch_count)(*ch_indexes)
+    data = (dh.DWReducedValue * (ch_count * count))()
+    stat = _get_reduced_values_block(ch_ids, ch_count, position, count,
+                                     ib_level, data)
+    if stat != 0:
+        raise RuntimeError(dh.DWStatus(stat).name)
+    if as_array:
+        return np.frombuffer(data, REDUCED_DTYPE).reshape(ch_count, count)
+    records = [(v.time_stamp, v.ave, v.min, v.max, v.rms) for v in data]
+    return [records[i * count:(i + 1) * count] for i in range(ch_count)]
+
+# --------------------------------------------------------------------
+
 _get_array_info_count = _lib.DWGetArrayInfoCount
 _get_array_info_count.argtypes = (ct.c_int,)
 _get_array_info_count.restype = ct.c_int
@@ -581,15 +1298,116 @@ def get_array_index_value(ch_index, array_info_index, array_value_index,
 
 # --------------------------------------------------------------------
 
+ArrayAxis = namedtuple('ArrayAxis', 'index name unit size values')
+
+
+def _axis_value(text):
+    """Return text as float if it is a number, else text."""
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def get_array_axes(channel, value_size=255, encoding=None):
+    """Return namedtuples with info and values of all axes of `channel`.
+
+    Return a list of `ArrayAxis` (index, name, unit, size, values),
+    the members of `ArrayInfo` and a tuple with the values of the axis,
+    as floats where numeric, else as str.
+
+    The result is kept for the opened file, so the library is asked for
+    each axis value (one call per value) only once per file and
+    channel.
+
+    channel : int or str
+        Channel index or name, resolved by `channel_index()`.
+
+    value_size, encoding
+        As for `get_array_index_value()`.
+
+    Wraps:
+        Nothing explicit. Support function calling DWGetArrayInfoList
+        and DWGetArrayIndexValue for all values.
+
+    """
+
+    index = channel_index(channel, encoding)
+    axes = _file_state.setdefault('array_axes', {})
+    key = (index, value_size, encoding)
+    if key not in axes:
+        textencoding = encoding or locale.getpreferredencoding()
+        textbuffer = ct.create_string_buffer(value_size + 1)
+        result = []
+        for info in get_array_info_list(index, encoding):
+            values = []
+            for value_index in range(info.size):
+                stat = _get_array_index_value(index, info.index, value_index,
+                                              textbuffer, value_size)
+                if stat != 0:
+                    raise RuntimeError(dh.DWStatus(stat).name)
+                values.append(
+                    _axis_value(textbuffer.value.decode(textencoding)))
+            result.append(ArrayAxis(*info, tuple(values)))
+        axes[key] = result
+    return axes[key]
+
+
+ArrayData = namedtuple('ArrayData', 'axes time_stamp data')
+
+
+def read_array_channel(channel, position=0, count=None, as_array=False,
+                       encoding=None):
+    """Return full speed data of array channel `channel` with its axes.
+
+    Return an `ArrayData` namedtuple (axes, time_stamp, data). axes is
+    from `get_array_axes()`, time_stamp has one element per array.
+
+    If `as_array` is True, data is a numpy array shaped (count, size)
+    with one row per array, or (count, size_0, size_1, ...) if the
+    channel has several axes whose sizes multiply to the array size.
+    Else data is a tuple of one tuple per array.
+
+    position : int
+        Position of the first array to read.
+
+    count : int (or None)
+        Number of arrays to read, to the end of the channel if None.
+
+    Wraps:
+        Nothing explicit. Support function for reading array channels.
+
+    """
+
+    index = channel_index(channel, encoding)
+    array_size = channel_catalog(encoding).by_index[index].array_size
+    axes = get_array_axes(index, encoding=encoding)
+    if count is None:
+        count = get_scaled_samples_count(index) - position
+    time, data = get_scaled_samples(index, position, count, array_size,
+                                    as_array=as_array)
+    if as_array:
+        sizes = tuple(axis.size for axis in axes)
+        if len(sizes) > 1 and math.prod(sizes) == array_size:
+            data = data.reshape((count,) + sizes)
+        else:
+            data = data.reshape(count, array_size)
+    else:
+        data = tuple(data[n * array_size:(n + 1) * array_size]
+                     for n in range(count))
+    return ArrayData(axes, time, data)
+
+# --------------------------------------------------------------------
+
 
-def channel_reduced(channel, reduction, encoding=None):
+def channel_reduced(channel, reduction, encoding=None, as_array=False):
     """Return a flat list of data for channel reduced to reduction.
 
     Parameters
     ----------
 
     channel : int or str
-        Either the channel index or the channel name.
+        Either the channel index or the channel name (or long name).
 
     reduction : int
         One of the following
@@ -600,29 +1418,161 @@ def channel_reduced(channel, reduction, encoding=None):
         rms = 4
 
     encoding : str
-        encoding to pass to `get_channel_list()`, which see. Ignored
+        encoding to pass to `channel_catalog()`, which see. Ignored
         (not meaningful) if channel is int.
 
+    as_array : bool
+        If True, return a numpy array (a view of the `reduction` field
+        of the array from `get_reduced_values()`) instead of a list.
+
     Wraps:
         Nothing explicit. This is a support function to simplify getting
         reduced data from a channel.
 
     """
 
-    index = channel if type(channel) is int else None
-
-    if index is None:
-        for ch in get_channel_list(encoding):
-            if ch.name == channel:
-                index = ch.index
-                break
-        else:                       # no break
-            raise ValueError(channel, 'not found in data')
-
+    index = channel_index(channel, encoding)
     cnt, _ = get_reduced_values_count(index)
+    if as_array:
+        records = get_reduced_values(index, 0, cnt, as_array=True)
+        return records[REDUCED_DTYPE.names[reduction]]
     return [rec[reduction] for rec in get_reduced_values(index, 0, cnt)]
 
 
+# --------------------------------------------------------------------
+
+
+def _time_stamp_at(index, position, array_size):
+    """Return the time stamp of sample `position` in channel `index`.
+
+    Probed time stamps are kept in a sparse index for the opened file.
+
+    """
+    probes = _file_state.setdefault('time_probes', {}).setdefault(index, {})
+    if position not in probes:
+        data = (ct.c_double * array_size)()
+        time = ct.c_double()
+        stat = _get_scaled_samples(index, position, 1, data, ct.byref(time))
+        if stat != 0:
+            raise RuntimeError(dh.DWStatus(stat).name)
+        probes[position] = time.value
+    return probes[position]
+
+
+def _search_position(index, t, count, array_size):
+    """Return the first position with a time stamp >= t.
+
+    Binary search with one sample probe reads, return `count` if all
+    time stamps are < t.
+
+    """
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _time_stamp_at(index, mid, array_size) < t:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _channel_rate(index, count, array_size):
+    """Return the sample rate of channel `index` from its time stamps.
+
+    Computed from the first and last time stamps, None if there are
+    less than two samples.
+
+    """
+    if count < 2:
+        return None
+    span = (_time_stamp_at(index, count - 1, array_size)
+            - _time_stamp_at(index, 0, array_size))
+    return (count - 1) / span if span > 0 else None
+
+
+def _window_position(index, t, count, array_size, rate):
+    """Return the first position with time stamp >= t.
+
+    If rate is given the position is computed from it and the time
+    stamp of the first sample, then checked with probe reads. The
+    binary search is used if rate is None or the check fails.
+
+    """
+    if count == 0:
+        return 0
+    if rate:
+        t_first = _time_stamp_at(index, 0, array_size)
+        guess = min(max(0, math.ceil((t - t_first) * rate - 1e-6)), count)
+        if ((guess == 0
+             or _time_stamp_at(index, guess - 1, array_size) < t)
+                and (guess == count
+                     or _time_stamp_at(index, guess, array_size) >= t)):
+            return guess
+    return _search_position(index, t, count, array_size)
+
+
+def window_positions(channel, t0, t1, encoding=None):
+    """Return (position, count) of the samples in time window [t0, t1).
+
+    `position` and `count` can be passed to `get_scaled_samples()` or
+    `iter_scaled_samples()` to read only the samples of `channel`
+    with time stamps t0 <= t < t1.
+
+    For sync channels in a file stored always fast the positions are
+    computed from the sample rate of the channel, (from its first and
+    last time stamps), and only checked by reading the time stamps on
+    each side of the window borders. Else the
+    positions are found by a binary search reading single time stamps,
+    which are kept in a sparse index for the opened file, so the cost
+    is proportional to the logarithm of the channel length.
+
+    channel : int or str
+        Channel index or name, resolved by `channel_index()`.
+
+    encoding : str
+        Passed to `channel_index()`.
+
+    Wraps:
+        Nothing explicit. Support function using DWGetScaledSamples
+        for time stamp probes.
+
+    """
+
+    index = channel_index(channel, encoding)
+    array_size = channel_catalog(encoding).by_index[index].array_size
+    count = get_scaled_samples_count(index)
+    rate = None
+    if (get_storing_type() == 0
+            and get_channel_props(index, dh.DWChannelProps.DW_CH_TYPE.value)
+            == dh.DWChannelType.DW_CH_TYPE_SYNC.value):
+        rate = _channel_rate(index, count, array_size)
+    first = _window_position(index, t0, count, array_size, rate)
+    if t1 <= t0:
+        return first, 0
+    last = _window_position(index, t1, count, array_size, rate)
+    return first, last - first
+
+
+def read_window(channel, t0, t1, as_array=False, encoding=None):
+    """Return full speed (time_stamp, data) of `channel` for t0 <= t < t1.
+
+    Only the samples in the window are read, see `window_positions()`.
+    `as_array` is passed to `get_scaled_samples()` and `encoding` to
+    `channel_index()`.
+
+    Wraps:
+        Nothing explicit. Support function to read a time window of a
+        channel.
+
+    """
+
+    index = channel_index(channel, encoding)
+    array_size = channel_catalog(encoding).by_index[index].array_size
+    position, count = window_positions(index, t0, t1, encoding)
+    return get_scaled_samples(index, position, count, array_size,
+                              as_array=as_array)
+
+
 STORING_TYPE = {
     0: 'ST_ALWAYS_FAST',
     1: 'ST_ALWAYS_SLOW',
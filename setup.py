@@ -28,6 +28,11 @@ setup(name='dwdat2py',
       license='Apache 2.0',
       packages=['dwdat2py'],
       package_data={'dwdat2py': ['libs/*so', 'libs/*dll', 'libs/*txt']},
+      extras_require={'numpy': ['numpy'],
+                      'hdf5': ['numpy', 'h5py'],
+                      'parquet': ['numpy', 'pyarrow']},
+      entry_points={'console_scripts': [
+          'dwdat2py-export = dwdat2py.export:main']},
       classifiers=[
           "Intended Audience :: Science/Research",
           "License :: OSI Approved :: Apache Software License",
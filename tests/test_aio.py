@@ -0,0 +1,93 @@
+"""
+Test the aio module.
+"""
+import os
+import sys
+import gzip
+import asyncio
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import wrappers
+from dwdat2py import aio
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+def samples(filename, index):
+    wrappers.init()
+    wrappers.open_data_file(filename)
+    try:
+        return wrappers.get_scaled_samples(
+            index, 0, wrappers.get_scaled_samples_count(index))
+    finally:
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+
+async def collect(reader, channel, **kwargs):
+    time, data = (), ()
+    async for ctime, cdata in reader.iter_samples(channel, **kwargs):
+        time += ctime
+        data += cdata
+    return time, data
+
+
+class TestAio(unittest.TestCase):
+
+    def tearDown(self):
+        asyncio.run(aio.shutdown())
+
+    def test_open_async(self):
+        async def main():
+            async with aio.open_async(DATAFILE1) as reader:
+                info = await reader.file_info()
+                catalog = await reader.channel_catalog()
+                return info, catalog.by_name['GPSvel']
+
+        info, index = asyncio.run(main())
+        self.assertEqual(info.sample_rate, 100)
+        self.assertEqual(index, 0)
+
+    def test_open_async_error(self):
+        async def main():
+            async with aio.open_async('no such file.d7d'):
+                pass
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(main())
+
+    def test_iter_samples(self):
+        async def main():
+            async with aio.open_async(DATAFILE1) as reader:
+                return await collect(reader, 'GPSvel', chunk=1000)
+
+        self.assertEqual(asyncio.run(main()), samples(DATAFILE1, 0))
+
+    def test_concurrent_readers(self):
+        # chunks of the two files interleave on the executor thread
+        async def main():
+            async with aio.open_async(DATAFILE1) as r1, \
+                    aio.open_async(DATAFILE2) as r2:
+                return await asyncio.gather(collect(r1, 0, chunk=500),
+                                            collect(r2, 1, chunk=1),
+                                            r1.read_window(0, 1, 2))
+
+        got1, got2, window = asyncio.run(main())
+        expected1 = samples(DATAFILE1, 0)
+        self.assertEqual(got1, expected1)
+        self.assertEqual(got2, samples(DATAFILE2, 1))
+        self.assertEqual(window[0], expected1[0][100:200])
+
+
+if __name__ == '__main__':
+    unittest.main()
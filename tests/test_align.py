@@ -0,0 +1,132 @@
+"""
+Test the align module.
+"""
+import os
+import sys
+import gzip
+import unittest
+from unittest import mock
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import wrappers
+
+try:
+    import numpy as np
+    from dwdat2py import align
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestAlign(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def samples(self, index):
+        count = wrappers.get_scaled_samples_count(index)
+        return wrappers.get_scaled_samples(index, 0, count, as_array=True)
+
+    def test_align_linear_rate(self):
+        # 100 Hz sync, async CAN and ~2 Hz async GPS channels
+        channels = [0, 'TEMP_OUTSIDE', 22]
+        time, values = align.align(channels, rate=7.3, chunk=97)
+        self.assertEqual(values.shape, (700, 3))
+        self.assertEqual(time[1], 1 / 7.3)
+        for column, index in enumerate((0, 14, 22)):
+            stime, sdata = self.samples(index)
+            expected = np.interp(time, stime, sdata, np.nan, np.nan)
+            self.assertTrue(np.array_equal(values[:, column], expected,
+                                           equal_nan=True))
+
+    def test_align_previous_reference(self):
+        time, values = align.align([3, 24], reference='V_SPEED2',
+                                   method='previous', chunk=100)
+        self.assertTrue(np.array_equal(time, self.samples(6)[0]))
+        stime, sdata = self.samples(24)
+        after = np.searchsorted(stime, time, 'right')
+        expected = np.where(after > 0, sdata[after - 1], np.nan)
+        self.assertTrue(np.array_equal(values[:, 1], expected,
+                                       equal_nan=True))
+
+    def test_align_nearest_window(self):
+        time, values = align.align([27], rate=100, method='nearest',
+                                   t0=20, t1=30, chunk=64)
+        self.assertEqual(len(time), 1000)
+        stime, sdata = self.samples(27)
+        self.assertTrue(np.array_equal(values[:, 0], sdata[2000:3000]))
+
+    def test_align_nearest_before_first(self):
+        # X absolute starts at 0.64 s
+        time, values = align.align([22], rate=10, method='nearest')
+        stime, sdata = self.samples(22)
+        before = time < stime[0]
+        self.assertTrue(before[:2].all())
+        self.assertTrue(np.isnan(values[before, 0]).all())
+        self.assertFalse(np.isnan(values[~before, 0]).any())
+
+    def test_iter_aligned_chunks(self):
+        blocks = list(align.iter_aligned([0, 1], rate=10, chunk=100))
+        self.assertEqual([len(time) for time, _ in blocks],
+                         [100] * 9 + [58])
+
+    def test_align_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            align.align([0], rate=10, method='cubic')
+        with self.assertRaises(ValueError):
+            align.align([0])
+
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestArrayChannel(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE2)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def test_array_channel(self):
+        with self.assertRaises(ValueError):
+            align.align([0], rate=10)
+
+    def test_array_reference(self):
+        # Counting, array_size 20, one sample
+        get_scaled_samples = wrappers._get_scaled_samples
+        sizes = []
+
+        def spy(ch_index, position, count, data, time):
+            if ch_index == 0:
+                sizes.append((count, len(data)))
+            return get_scaled_samples(ch_index, position, count, data, time)
+
+        with mock.patch.object(wrappers, '_get_scaled_samples', spy):
+            time, values = align.align([1], reference=0, t1=5)
+        self.assertTrue(sizes)
+        self.assertTrue(all(len_data >= count * 20
+                            for count, len_data in sizes))
+        self.assertEqual(time.tolist(), [4.441])
+        self.assertTrue(np.isnan(values).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
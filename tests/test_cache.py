@@ -0,0 +1,121 @@
+"""
+Test the cache module.
+"""
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+import dwdat2py
+from dwdat2py import cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+class TestFileMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_file_metadata(self):
+        meta = cache.file_metadata(DATAFILE1, self.tmpdir)
+        self.assertEqual(meta.sample_rate, 100.0)
+        self.assertEqual(meta.duration, 95.8)
+        self.assertEqual(meta.storing_type, 0)
+        self.assertEqual(len(meta.channels), 20)
+        ch = meta.channels[0]
+        self.assertEqual((ch.index, ch.name, ch.long_name, ch.scaled_count,
+                          ch.reduced_count, ch.block_size),
+                         (0, 'GPSvel', 'GPSvel', 9580, 192, 0.5))
+        self.assertEqual(meta.channels[-1].scale, 0.000277777784503996)
+
+    def test_file_metadata_cache_hit(self):
+        meta = cache.file_metadata(DATAFILE1, self.tmpdir)
+        self.assertEqual(len(os.listdir(self.tmpdir)), 1)
+        with mock.patch.object(dwdat2py, 'wrappersimport',
+                               side_effect=AssertionError('no cache hit')):
+            self.assertEqual(cache.file_metadata(DATAFILE1, self.tmpdir),
+                             meta)
+
+    def test_file_metadata_not_writable(self):
+        # as in a read-only archive, (permissions do not stop root)
+        with mock.patch.object(cache, '_write_json',
+                               side_effect=PermissionError('read-only')):
+            meta = cache.file_metadata(DATAFILE1, self.tmpdir)
+        self.assertEqual(meta.channels[0].name, 'GPSvel')
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_file_metadata_sidecar_invalidated(self):
+        datafile = os.path.join(self.tmpdir, 'Test2.dxd')
+        shutil.copy(DATAFILE2, datafile)
+        meta = cache.file_metadata(datafile)
+        self.assertTrue(os.path.exists(datafile + cache.SIDECAR_SUFFIX))
+        self.assertEqual(meta.channels[0].array_size, 20)
+        st = os.stat(datafile)
+        os.utime(datafile, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        with mock.patch.object(dwdat2py, 'wrappersimport',
+                               side_effect=RuntimeError('miss')):
+            with self.assertRaises(RuntimeError):
+                cache.file_metadata(datafile)
+        self.assertEqual(cache.file_metadata(datafile), meta)
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestCachedSamples(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_cached_samples(self):
+        samples = cache.cached_samples(DATAFILE1, [0, 'TEMP_OUTSIDE'],
+                                       self.tmpdir, chunk=1000)
+        with dwdat2py.wrappersimport(DATAFILE1) as wi:
+            expected = wi.get_scaled_samples(14, 0, 479)
+        time, data = samples['TEMP_OUTSIDE']
+        self.assertIsInstance(time, np.memmap)
+        self.assertFalse(data.flags.writeable)
+        self.assertEqual(tuple(time.tolist()), expected[0])
+        self.assertEqual(tuple(data.tolist()), expected[1])
+        self.assertEqual(samples[0][1].shape, (9580,))
+
+    def test_cached_samples_cache_hit(self):
+        first = cache.cached_samples(DATAFILE2, [0, 1], self.tmpdir)
+        with mock.patch.object(dwdat2py, 'wrappersimport',
+                               side_effect=AssertionError('no cache hit')):
+            again = cache.cached_samples(DATAFILE2, ['Counting', 1],
+                                         self.tmpdir)
+        self.assertEqual(again['Counting'][1].shape, (1, 20))
+        self.assertTrue((again['Counting'][1] == first[0][1]).all())
+        self.assertEqual(again[1][0].shape, (0,))
+
+    def test_cached_samples_missing_channel(self):
+        with self.assertRaises(ValueError):
+            cache.cached_samples(DATAFILE2, ['no such channel'], self.tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
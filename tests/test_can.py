@@ -0,0 +1,110 @@
+"""
+Test the can module.
+"""
+import os
+import sys
+import struct
+import unittest
+import ctypes as ct
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+try:
+    import numpy as np
+    from dwdat2py import can
+except ImportError:
+    np = None
+
+from dwdat2py import wrappers
+from dwdat2py import DWDataReaderHeader as dh
+
+
+def binary_samples(records):
+    """Return BinarySamples as from get_binary_samples for records.
+
+    records are (time_stamp, record bytes).
+
+    """
+    buffer = b''.join(struct.pack('i', len(rec)) + rec for _, rec in records)
+    offsets, data = wrappers.parse_binary_records(buffer, len(records),
+                                                  as_array=True)
+    time = np.array([time for time, _ in records])
+    return wrappers.BinarySamples(time, offsets, data)
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestCan(unittest.TestCase):
+    """Test decoding of synthetic CAN samples, (none in test files)."""
+
+    def setUp(self):
+        records = []
+        for n in range(100):
+            arb_id = 0x100 if n % 2 else 0x200
+            # little endian 16 bit n * 3 at bit 8, big endian signed
+            # 12 bit -n with msb at bit 39 (byte 4)
+            payload = bytearray(8)
+            payload[1:3] = struct.pack('<H', n * 3)
+            payload[4:6] = struct.pack('>h', -n << 4)
+            records.append((n * 0.01, struct.pack('<I', arb_id)
+                            + bytes(payload)))
+        records.append((1.0, struct.pack('<I', 0x300) + b'\x07\x08'))
+        self.frames = can.decode_frames(binary_samples(records))
+
+    def test_decode_frames(self):
+        frames = self.frames
+        self.assertEqual(frames.dtype, can.CAN_FRAME_DTYPE)
+        self.assertEqual(len(frames), 101)
+        self.assertEqual(frames['arb_id'][:2].tolist(), [0x200, 0x100])
+        self.assertEqual(frames['time_stamp'][1], 0.01)
+        self.assertEqual(frames['dlc'][0], 8)
+        self.assertEqual(frames['dlc'][-1], 2)
+        self.assertEqual(frames['payload'][-1].tolist(),
+                         [7, 8, 0, 0, 0, 0, 0, 0])
+
+    def test_filter_ids(self):
+        frames = can.filter_ids(self.frames, [0x100, 0x300])
+        self.assertEqual(len(frames), 51)
+        self.assertTrue((frames['arb_id'] != 0x200).all())
+
+    def test_extract_signal_little(self):
+        frames = can.filter_ids(self.frames, [0x100])
+        values = can.extract_signal(frames, 8, 16, factor=0.5, offset=1)
+        self.assertEqual(values.tolist(),
+                         [n * 3 * 0.5 + 1 for n in range(1, 100, 2)])
+
+    def test_extract_signal_big_signed(self):
+        frames = self.frames[:100]
+        values = can.extract_signal(frames, 39, 12, byte_order='big',
+                                    signed=True)
+        self.assertEqual(values.tolist(), [-n for n in range(100)])
+
+    def test_extract_signal_too_long(self):
+        with self.assertRaises(ValueError):
+            can.extract_signal(self.frames, 7, 64)
+
+    def test_decode_frames_fd(self):
+        payload = bytes(range(64))
+        record = struct.pack('<I4B', 0x123, 1, 0, 0, 64) + payload
+        frames = can.decode_frames(binary_samples([(0.5, record)]), fd=True)
+        self.assertEqual(frames.dtype, can.CANFD_FRAME_DTYPE)
+        self.assertEqual(frames['arb_id'][0], 0x123)
+        self.assertEqual(frames['extended'][0], 1)
+        self.assertEqual(frames['dlc'][0], 64)
+        self.assertEqual(frames['payload'][0].tobytes(), payload)
+        value = can.extract_signal(frames, 60 * 8, 32)
+        self.assertEqual(value[0], struct.unpack('<I', payload[60:])[0])
+
+    def test_record_sizes(self):
+        # the layout in the data files, shared with wrappers
+        self.assertEqual(ct.sizeof(dh.DWCANPortData), 12)
+        self.assertEqual(ct.sizeof(dh.DWCANFDPortData), 72)
+        self.assertEqual(
+            wrappers.BINARY_SAMPLE_SIZES[dh.DWDataType.dtCANPortData.value],
+            12)
+
+
+if __name__ == '__main__':
+    unittest.main()
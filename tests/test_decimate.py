@@ -0,0 +1,108 @@
+"""
+Test the decimate module.
+"""
+import os
+import sys
+import gzip
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import wrappers
+
+try:
+    import numpy as np
+    from dwdat2py import decimate
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestDownsample(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def test_downsample_reduced(self):
+        # reduced block size is 0.5 s
+        reduced = decimate.downsample('GPSvel', 0, 96, 96)
+        self.assertEqual(reduced.source, 'reduced')
+        self.assertEqual(len(reduced.time_stamp), 96)
+        time, data = wrappers.get_scaled_samples(0, 0, 9580, as_array=True)
+        full_min = data[:9500].reshape(-1, 100).min(axis=1)
+        full_max = data[:9500].reshape(-1, 100).max(axis=1)
+        self.assertTrue(np.allclose(reduced.min[:95], full_min[:95],
+                                    atol=0.01))
+        self.assertTrue(np.allclose(reduced.max[:95], full_max[:95],
+                                    atol=0.01))
+
+    def test_downsample_full_minmax(self):
+        result = decimate.downsample(0, 10, 20, 50, chunk=64)
+        self.assertEqual(result.source, 'full')
+        time, data = wrappers.read_window(0, 10, 20, as_array=True)
+        self.assertEqual(len(result.min), 50)
+        self.assertFalse(np.isnan(result.min).any())
+        self.assertEqual(result.min.min(), data.min())
+        self.assertEqual(result.max.max(), data.max())
+        self.assertTrue((result.min <= result.max).all())
+
+    def test_downsample_full_empty_buckets(self):
+        # ~2 Hz channel, most of the 100 buckets are empty
+        result = decimate.downsample('X absolute', 10, 20, 100)
+        self.assertEqual(np.isnan(result.min).sum(), 80)
+
+    def test_downsample_lttb(self):
+        result = decimate.downsample(0, 10, 20, 50, method='lttb')
+        self.assertEqual(result.source, 'full')
+        self.assertEqual(len(result.time_stamp), 50)
+        self.assertEqual(result.time_stamp[0], 10.0)
+        self.assertEqual(result.time_stamp[-1], 19.99)
+        self.assertTrue((np.diff(result.time_stamp) > 0).all())
+
+    def test_lttb_short(self):
+        time, data = decimate.lttb([0, 1, 2], [5, 6, 7], 10)
+        self.assertEqual(data.tolist(), [5, 6, 7])
+
+    def test_lttb_peak_kept(self):
+        data = np.zeros(1000)
+        data[500] = 10
+        time, values = decimate.lttb(np.arange(1000.0), data, 20)
+        self.assertIn(500.0, time.tolist())
+
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestArrayChannel(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE2)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def test_array_channel(self):
+        # Counting, array_size 20
+        for method in ('minmax', 'lttb'):
+            with self.assertRaises(ValueError):
+                decimate.downsample(0, 0, 5, 10, method=method)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Test the export module.
+"""
+import os
+import sys
+import gzip
+import shutil
+import tempfile
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+import dwdat2py
+from dwdat2py import export
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_export_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export.export(DATAFILE1, os.path.join(self.tmpdir, 'out.txt'))
+
+    @unittest.skipIf(h5py is None, 'h5py not available')
+    def test_export_hdf5(self):
+        outpath = os.path.join(self.tmpdir, 'out.h5')
+        export.main([DATAFILE1, outpath, '--chunk', '1000'])
+        with dwdat2py.wrappersimport(DATAFILE1) as wi:
+            channels = wi.get_channel_list()
+            expected = wi.get_scaled_samples(22, 0, 191)
+        with h5py.File(outpath, 'r') as h5:
+            self.assertEqual(h5.attrs['sample_rate'], 100.0)
+            self.assertEqual(len(h5), len(channels))
+            grp = h5['ch22']
+            self.assertEqual(grp.attrs['name'], 'X absolute')
+            self.assertEqual(grp.attrs['channel_type'], 'DW_CH_TYPE_ASYNC')
+            self.assertEqual(tuple(grp['time_stamp'][:]), expected[0])
+            self.assertEqual(tuple(grp['data'][:]), expected[1])
+            self.assertEqual(h5['ch0/data'].shape, (9580,))
+
+    @unittest.skipIf(h5py is None, 'h5py not available')
+    def test_export_hdf5_array_channel(self):
+        outpath = os.path.join(self.tmpdir, 'out.hdf5')
+        export.export(DATAFILE2, outpath)
+        with h5py.File(outpath, 'r') as h5:
+            self.assertEqual(h5['ch0/data'].shape, (1, 20))
+            self.assertEqual(h5['ch1/data'].shape, (0,))
+
+    @unittest.skipIf(pq is None, 'pyarrow not available')
+    def test_export_parquet(self):
+        outpath = os.path.join(self.tmpdir, 'out')
+        export.export(DATAFILE1, outpath, 'parquet', ['GPSvel', 14],
+                      chunk=100)
+        self.assertEqual(sorted(os.listdir(outpath)),
+                         ['ch0.parquet', 'ch14.parquet'])
+        table = pq.read_table(os.path.join(outpath, 'ch14.parquet'))
+        with dwdat2py.wrappersimport(DATAFILE1) as wi:
+            time, data = wi.get_scaled_samples(14, 0, 479)
+        self.assertEqual(tuple(table.column('time_stamp').to_pylist()), time)
+        self.assertEqual(tuple(table.column('data').to_pylist()), data)
+        self.assertEqual(table.schema.metadata[b'unit'], b'deg. C')
+
+    @unittest.skipIf(pq is None, 'pyarrow not available')
+    def test_export_parquet_array_channel(self):
+        outpath = os.path.join(self.tmpdir, 'out.pq')
+        export.export(DATAFILE2, outpath)
+        table = pq.read_table(os.path.join(outpath, 'ch0.parquet'))
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(len(table.column('data')[0]), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ Test the __init__ module.
 """
 import os
 import sys
+import gzip
 import unittest
 import tempfile
 import importlib
@@ -15,6 +16,7 @@ sys.path.insert(0, packdir)
 import dwdat2py
 
 DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
 
 if not os.path.exists(DATAFILE1):
     with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
@@ -92,5 +94,57 @@ class TestWrappersImport(unittest.TestCase):
             self.assertEqual(DATAFILE1RECORDS_CH0[95.5][0], averages[-1])
 
 
+class TestSession(unittest.TestCase):
+
+    def test_session_files(self):
+        with dwdat2py.Session() as session:
+            for _ in range(3):
+                with session.file(DATAFILE1) as wi:
+                    self.assertTrue(session.is_open)
+                    self.assertEqual(wi.fileinfo.duration, 95.8)
+                    self.assertEqual(session.fileinfo, wi.fileinfo)
+                    self.assertEqual(wi.get_channel_list_count(), 20)
+                self.assertFalse(session.is_open)
+            session.open(DATAFILE2)
+            session.open(DATAFILE1)     # closes DATAFILE2 first
+            self.assertEqual(session.filename, DATAFILE1)
+        self.assertFalse(session.active)
+        timings = session.timings()
+        self.assertEqual(timings['init'].count, 1)
+        self.assertEqual(timings['open'].count, 5)
+        self.assertEqual(timings['close'].count, 5)
+        self.assertEqual(timings['de_init'].count, 1)
+        self.assertGreater(timings['open'].seconds, 0)
+
+    def test_session_close_not_opened(self):
+        session = dwdat2py.Session()
+        session.close()
+        session.end()
+        session.start()
+        try:
+            session.close()
+            session.close()
+            with self.assertRaises(RuntimeError):
+                session.start()
+        finally:
+            session.end()
+        self.assertNotIn('close', session.timings())
+
+    def test_session_open_error(self):
+        with dwdat2py.Session() as session:
+            with self.assertRaises(RuntimeError):
+                session.open('no such file.d7d')
+            self.assertFalse(session.is_open)
+            with session.file(DATAFILE1) as wi:
+                self.assertEqual(wi.get_channel_list_count(), 20)
+
+    def test_session_phase(self):
+        with dwdat2py.Session() as session:
+            for _ in range(2):
+                with session.file(DATAFILE1) as wi, session.phase('read'):
+                    wi.get_scaled_samples(0, 0, 100)
+        self.assertEqual(session.timings()['read'].count, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+"""
+Test the instrument module.
+"""
+import os
+import sys
+import gzip
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import wrappers
+from dwdat2py import instrument
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+class TestInstrument(unittest.TestCase):
+
+    def setUp(self):
+        instrument.reset()
+        instrument.enable()
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+        instrument.disable()
+        instrument.reset()
+
+    def test_stats(self):
+        for _ in range(3):
+            wrappers.get_scaled_samples(0, 0, 1000)
+        stats = instrument.stats()
+        public = stats['get_scaled_samples']
+        self.assertEqual(public.calls, 3)
+        self.assertEqual(public.nbytes, 3 * 2 * 8 * 1000)
+        self.assertGreater(public.lib_seconds, 0)
+        self.assertGreater(public.seconds, public.lib_seconds)
+        library = stats['DWGetScaledSamples']
+        self.assertEqual(library.calls, 3)
+        self.assertEqual(library.seconds, library.lib_seconds)
+        self.assertEqual(stats['DWOpenDataFile'].calls, 1)
+        self.assertEqual(stats['open_data_file'].calls, 1)
+
+    def test_nested(self):
+        wrappers.channel_reduced('GPSvel', 1)
+        stats = instrument.stats()
+        outer = stats['channel_reduced']
+        inner = stats['get_reduced_values']
+        self.assertEqual(inner.calls, 1)
+        self.assertGreaterEqual(outer.lib_seconds, inner.lib_seconds)
+        self.assertGreaterEqual(outer.seconds, inner.seconds)
+        self.assertEqual(outer.nbytes, 192 * 8)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_nbytes_array(self):
+        wrappers.get_reduced_values(0, 0, 192, as_array=True)
+        self.assertEqual(instrument.stats()['get_reduced_values'].nbytes,
+                         192 * 40)
+
+    def test_nbytes_array_channel(self):
+        wrappers.close_data_file()
+        wrappers.open_data_file(DATAFILE2)
+        # Counting, array_size 20, one sample
+        for as_array in (False, True)[:1 if np is None else 2]:
+            wrappers.get_scaled_samples(0, 0, 1, 20, as_array)
+        stats = instrument.stats()['get_scaled_samples']
+        self.assertEqual(stats.nbytes, stats.calls * (8 + 20 * 8))
+
+    def test_generator_library_calls(self):
+        for _ in wrappers.iter_scaled_samples(0, 1000):
+            pass
+        stats = instrument.stats()
+        self.assertNotIn('iter_scaled_samples', stats)
+        self.assertEqual(stats['DWGetScaledSamples'].calls, 10)
+
+    def test_error(self):
+        with self.assertRaises(RuntimeError):
+            wrappers.get_scaled_samples(999, 0, 10)
+        self.assertEqual(instrument.stats()['get_scaled_samples'].calls, 1)
+
+    def test_hooks(self):
+        calls = []
+
+        def hook(name, call_stats):
+            calls.append((name, call_stats.calls))
+
+        instrument.add_hook(hook)
+        try:
+            wrappers.get_channel_factors(0)
+        finally:
+            instrument.remove_hook(hook)
+        wrappers.get_channel_factors(0)
+        self.assertEqual(calls, [('DWGetChannelFactors', 1),
+                                 ('get_channel_factors', 1)])
+
+    def test_disable(self):
+        instrument.disable()
+        self.assertFalse(instrument.enabled())
+        self.assertNotIn('timed', wrappers.get_scaled_samples.__code__
+                         .co_name)
+        wrappers.get_scaled_samples(0, 0, 10)
+        self.assertNotIn('get_scaled_samples', instrument.stats())
+        instrument.enable()
+        self.assertTrue(instrument.enabled())
+        wrappers.get_scaled_samples(0, 0, 10)
+        self.assertIn('get_scaled_samples', instrument.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
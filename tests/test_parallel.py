@@ -0,0 +1,119 @@
+"""
+Test the parallel module.
+"""
+import os
+import sys
+import gzip
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import parallel
+from dwdat2py import wrappers
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+class TestReadMany(unittest.TestCase):
+
+    def test_read_many_reduced_ordered(self):
+        paths = [DATAFILE1, DATAFILE2, DATAFILE1]
+        results = list(parallel.read_many(paths, [1], reduction=0,
+                                          workers=2))
+        self.assertEqual([res.path for res in results], paths)
+        self.assertEqual(results[0].fileinfo.sample_rate, 100.0)
+        self.assertEqual(results[1].fileinfo.sample_rate, 20000.0)
+        self.assertEqual(max(results[0].data[1]), 95.5)
+        self.assertEqual(max(results[1].data[1]), 4.4)
+
+    def test_read_many_full_unordered(self):
+        paths = [DATAFILE1] * 3
+        results = list(parallel.read_many(paths, ['GPSvel', 14],
+                                          workers=2, ordered=False))
+        self.assertEqual(len(results), 3)
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+        try:
+            expected = wrappers.get_scaled_samples(14, 0, 479)
+        finally:
+            wrappers.close_data_file()
+            wrappers.de_init()
+        for res in results:
+            self.assertEqual(res.data[14], expected)
+            self.assertEqual(len(res.data['GPSvel'][0]), 9580)
+
+    def test_read_many_bounded(self):
+        consumed = []
+
+        def paths():
+            for n in range(6):
+                consumed.append(n)
+                yield DATAFILE2
+
+        results = parallel.read_many(paths(), [1], reduction=0, workers=1)
+        self.assertEqual(next(results).path, DATAFILE2)
+        # two submitted ahead for one worker, one more after the result
+        self.assertEqual(len(consumed), 3)
+        self.assertEqual(len(list(results)), 5)
+        self.assertEqual(len(consumed), 6)
+
+    def test_read_many_missing_channel(self):
+        with self.assertRaises(ValueError):
+            list(parallel.read_many([DATAFILE1], ['no such channel'],
+                                    reduction=1, workers=1))
+
+
+class TestReadOneFile(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def test_read_channels(self):
+        channels = [0, 'ACC', 14, 22, 27]
+        data = parallel.read_channels(DATAFILE1, channels, workers=2)
+        self.assertEqual(list(data), channels)
+        for channel in channels:
+            index = wrappers.channel_index(channel)
+            count = wrappers.get_scaled_samples_count(index)
+            self.assertEqual(data[channel],
+                             wrappers.get_scaled_samples(index, 0, count))
+
+    def test_read_channels_reduced(self):
+        data = parallel.read_channels(DATAFILE1, [0, 27], reduction=1,
+                                      workers=2)
+        self.assertEqual(data[27], wrappers.channel_reduced(27, 1))
+
+    def test_read_channel(self):
+        expected = wrappers.get_scaled_samples(0, 0, 9580)
+        self.assertEqual(parallel.read_channel(DATAFILE1, 'GPSvel',
+                                               workers=3),
+                         expected)
+        if np is None:
+            return
+        time, data = parallel.read_channel(DATAFILE1, 'GPSvel', workers=2,
+                                           as_array=True)
+        self.assertIsInstance(data, np.ndarray)
+        self.assertEqual((tuple(time.tolist()), tuple(data.tolist())),
+                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Test the prefetch module.
+"""
+import os
+import sys
+import gzip
+import threading
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import wrappers
+from dwdat2py import prefetch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+def prefetch_threads():
+    return [t for t in threading.enumerate()
+            if t.name == 'dwdat2py-prefetch']
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def test_iter_prefetched(self):
+        expected = list(wrappers.iter_scaled_samples(0, 1000))
+        got = list(prefetch.iter_prefetched(0, 1000))
+        self.assertEqual(got, expected)
+        self.assertEqual(prefetch_threads(), [])
+
+    def test_iter_prefetched_position_count(self):
+        got = list(prefetch.iter_prefetched(0, 7, position=100, count=20,
+                                            depth=1))
+        self.assertEqual([len(t) for t, _ in got], [7, 7, 6])
+        time, data = wrappers.get_scaled_samples(0, 100, 20)
+        self.assertEqual(sum((t for t, _ in got), ()), time)
+        self.assertEqual(sum((d for _, d in got), ()), data)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_iter_prefetched_as_array(self):
+        time, data = wrappers.get_scaled_samples(0, 0, 9580, as_array=True)
+        position = 0
+        for ctime, cdata in prefetch.iter_prefetched(0, 1000,
+                                                     as_array=True):
+            n = len(ctime)
+            self.assertEqual(ctime.tolist(), time[position:position + n]
+                             .tolist())
+            self.assertEqual(cdata.tolist(), data[position:position + n]
+                             .tolist())
+            position += n
+        self.assertEqual(position, 9580)
+
+    def test_iter_prefetched_close(self):
+        chunks = prefetch.iter_prefetched(0, 10)
+        next(chunks)
+        self.assertEqual(len(prefetch_threads()), 1)
+        chunks.close()
+        self.assertEqual(prefetch_threads(), [])
+
+    def test_iter_prefetched_error(self):
+        with self.assertRaises(RuntimeError):
+            list(prefetch.iter_prefetched(999, 10, count=10))
+        self.assertEqual(prefetch_threads(), [])
+        with self.assertRaises(ValueError):
+            next(prefetch.iter_prefetched(0, depth=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
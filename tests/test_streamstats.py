@@ -0,0 +1,139 @@
+"""
+Test the streamstats module.
+"""
+import os
+import sys
+import gzip
+import math
+import unittest
+
+# Testing the local package
+here = os.path.dirname(__file__)
+packdir = os.path.abspath(os.path.join(here, os.pardir))
+sys.path.insert(0, packdir)
+
+from dwdat2py import wrappers
+
+try:
+    import numpy as np
+    from dwdat2py import streamstats
+except ImportError:
+    np = None
+
+DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
+DATAFILE2 = os.path.join(here, 'Test2.dxd')
+
+if not os.path.exists(DATAFILE1):
+    with gzip.open(DATAFILE1 + '.gz') as fi, open(DATAFILE1, 'wb') as fo:
+        fo.write(fi.read())
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestChannelStats(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE1)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def samples(self, index):
+        count = wrappers.get_scaled_samples_count(index)
+        return wrappers.get_scaled_samples(index, 0, count, as_array=True)
+
+    def test_moments(self):
+        stats = streamstats.channel_stats([0, 'ENG_RPM'], chunk=1000)
+        for channel, index in ((0, 0), ('ENG_RPM', 8)):
+            _, data = self.samples(index)
+            dev = data - data.mean()
+            result = stats[channel]
+            self.assertEqual(result.count, len(data))
+            self.assertAlmostEqual(result.mean, data.mean(), delta=1e-9)
+            self.assertAlmostEqual(result.std, data.std(), delta=1e-9)
+            self.assertAlmostEqual(result.skewness,
+                                   (dev ** 3).mean() / data.std() ** 3)
+            self.assertAlmostEqual(result.kurtosis,
+                                   (dev ** 4).mean() / data.var() ** 2 - 3)
+
+    def test_min_max(self):
+        result = streamstats.channel_stats([3], chunk=100)[3]
+        time, data = self.samples(3)
+        self.assertEqual(result.min, data.min())
+        self.assertEqual(result.min_time, time[data.argmin()])
+        self.assertEqual(result.max, data.max())
+        self.assertEqual(result.max_time, time[data.argmax()])
+
+    def test_quantiles(self):
+        result = streamstats.channel_stats(['GPSvel'], chunk=500)['GPSvel']
+        _, data = self.samples(0)
+        qs = [0, 0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.999, 1]
+        span = data.max() - data.min()
+        errors = np.abs(result.digest.quantile(qs) - np.quantile(data, qs))
+        self.assertLess(errors.max(), 0.005 * span)
+        self.assertEqual(errors[0], 0)
+        self.assertEqual(errors[-1], 0)
+        self.assertLessEqual(len(result.digest.means), 51)
+
+    def test_histogram(self):
+        edges = np.linspace(0, 100, 11)
+        stats = streamstats.channel_stats(
+            ['GPSvel', 3], edges={'GPSvel': edges}, chunk=1000)
+        self.assertIsNone(stats[3].histogram)
+        histogram = stats['GPSvel'].histogram
+        _, data = self.samples(0)
+        self.assertEqual(histogram.counts.tolist(),
+                         np.histogram(data, edges)[0].tolist())
+        self.assertEqual(histogram.below, (data < 0).sum())
+        self.assertEqual(histogram.above, (data > 100).sum())
+
+    def test_window(self):
+        result = streamstats.channel_stats([0], t0=10, t1=20)[0]
+        time, data = wrappers.read_window(0, 10, 20, as_array=True)
+        self.assertEqual(result.count, 1000)
+        self.assertAlmostEqual(result.mean, data.mean())
+        self.assertEqual(streamstats.channel_stats([0], t0=90)[0].count,
+                         9580 - 9000)
+
+    def test_empty(self):
+        result = streamstats.StreamStats().result()
+        self.assertEqual(result.count, 0)
+        self.assertTrue(math.isnan(result.mean))
+        self.assertTrue(math.isnan(result.min))
+        self.assertTrue(math.isnan(result.digest.quantile(0.5)))
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestArrayChannel(unittest.TestCase):
+
+    def setUp(self):
+        wrappers.init()
+        wrappers.open_data_file(DATAFILE2)
+
+    def tearDown(self):
+        wrappers.close_data_file()
+        wrappers.de_init()
+
+    def test_array_channel(self):
+        with self.assertRaises(ValueError):
+            streamstats.channel_stats([0])
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestTDigest(unittest.TestCase):
+
+    def test_merge(self):
+        values = np.random.default_rng(1).normal(size=20000)
+        first, second = streamstats.TDigest(), streamstats.TDigest()
+        first.update(values[:10000])
+        second.update(values[10000:])
+        first.merge(second)
+        self.assertEqual(first.count, 20000)
+        qs = [0.01, 0.1, 0.5, 0.9, 0.99]
+        errors = np.abs(first.quantile(qs) - np.quantile(values, qs))
+        self.assertLess(errors.max(), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
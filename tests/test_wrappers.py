@@ -5,6 +5,10 @@ import sys
 import os
 import unittest
 import gzip
+import struct
+import array
+import subprocess
+from unittest import mock
 from itertools import zip_longest
 from collections import namedtuple
 
@@ -21,6 +25,11 @@ except EnvironmentError as e:
     print('tests not possible without the lib, please see README.')
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 DATAFILE1 = os.path.join(here, 'Example_Drive01.d7d')
 DATAFILE2 = os.path.join(here, 'Test2.dxd')
 
@@ -161,6 +170,33 @@ class TestWrappersTestfile2(unittest.TestCase):
         # DATAFILE2 has no normal scaled samples
         pass
 
+    def test_get_array_axes(self):
+        axes = wrappers.get_array_axes('Counting')
+        self.assertEqual(len(axes), 1)
+        self.assertEqual(axes[0][:4], (0, 'Range', '', 20))
+        self.assertEqual(axes[0].values[:3], (0.2, 0.8, 1.2))
+        self.assertEqual(len(axes[0].values), 20)
+        self.assertIs(wrappers.get_array_axes(0), axes)
+        self.assertEqual(wrappers.get_array_axes(1), [])
+
+    def test_read_array_channel(self):
+        array = wrappers.read_array_channel(0)
+        self.assertEqual(array.axes, wrappers.get_array_axes(0))
+        self.assertEqual(array.time_stamp, (4.441,))
+        self.assertEqual(array.data, ((0.0,) * 20,))
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_read_array_channel_as_array(self):
+        array = wrappers.read_array_channel('Counting', as_array=True)
+        self.assertEqual(array.data.shape, (1, 20))
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_scaled_samples_as_array_2d(self):
+        time, data = wrappers.get_scaled_samples(0, 0, 1, 20, as_array=True)
+        self.assertEqual(time.shape, (1,))
+        self.assertEqual(data.shape, (1, 20))
+        self.assertEqual(data.dtype, np.float64)
+
     def test_channel_reduced_time_stamps_by_index(self):
         #      0        1    2    3    4
         # (time_stamp, ave, min, max, rms)
@@ -230,6 +266,9 @@ class TestWrappersExampleFile01(unittest.TestCase):
         self.assertEqual(storeint, 0)
         self.assertEqual(wrappers.STORING_TYPE[storeint], 'ST_ALWAYS_FAST')
 
+    def test_file_info(self):
+        self.assertEqual(wrappers.file_info(), self.dwfileinfo)
+
     def test_fileinfo_members(self):
         self.assertEqual(self.dwfileinfo.sample_rate, 100.0)
         # assertAlmostEqual is also available
@@ -267,6 +306,68 @@ class TestWrappersExampleFile01(unittest.TestCase):
             for recvalue, should in zip_longest(recdict[timestamp], values):
                 self.assertEqual(recvalue, should)
 
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_reduced_values_as_array(self):
+        records = wrappers.get_reduced_values(0, 0, 192, as_array=True)
+        self.assertEqual(records.shape, (192,))
+        self.assertEqual(records.dtype.itemsize, 40)
+        self.assertEqual([tuple(rec) for rec in records.tolist()],
+                         wrappers.get_reduced_values(0, 0, 192))
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_channel_reduced_as_array(self):
+        for reduction in range(5):
+            values = wrappers.channel_reduced('GPSvel', reduction,
+                                              as_array=True)
+            self.assertEqual(values.tolist(),
+                             wrappers.channel_reduced(0, reduction))
+
+    def test_get_reduced_values_block(self):
+        indexes = [ch.index for ch in wrappers.get_channel_list()]
+        blocks = wrappers.get_reduced_values_block(indexes, 0, 192)
+        self.assertEqual(len(blocks), len(indexes))
+        for index, block in zip(indexes, blocks):
+            self.assertEqual(block,
+                             wrappers.get_reduced_values(index, 0, 192))
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_reduced_values_block_as_array(self):
+        block = wrappers.get_reduced_values_block([0, 27], 10, 50,
+                                                  as_array=True)
+        self.assertEqual(block.shape, (2, 50))
+        self.assertEqual(block.dtype.names,
+                         ('time_stamp', 'ave', 'min', 'max', 'rms'))
+        for row, index in zip(block, (0, 27)):
+            self.assertEqual([tuple(rec) for rec in row.tolist()],
+                             wrappers.get_reduced_values(index, 10, 50))
+
+    def test_get_channel_props_longname(self):
+        self.assertEqual(wrappers.get_channel_props(0, 13), 'GPSvel')
+        self.assertEqual(wrappers.get_channel_props(0, 14), 7)
+
+    def test_channel_catalog(self):
+        catalog = wrappers.channel_catalog()
+        self.assertIs(catalog, wrappers.channel_catalog())
+        self.assertEqual(catalog.channels, wrappers.get_channel_list())
+        self.assertEqual(catalog.by_name['CNT 0'], 27)
+        self.assertEqual(catalog.by_index[27].name, 'CNT 0')
+        self.assertEqual(catalog.long_names[0], 'GPSvel')
+        self.assertEqual(catalog.index('ACC'), 21)
+        self.assertEqual(catalog.index(21), 21)
+        with self.assertRaises(ValueError):
+            catalog.index('no such channel')
+        with self.assertRaises(ValueError):
+            catalog.index(2)
+
+    def test_channel_catalog_invalidated_on_close(self):
+        catalog = wrappers.channel_catalog()
+        wrappers.close_data_file()
+        wrappers.open_data_file(DATAFILE2)
+        self.assertIsNot(catalog, wrappers.channel_catalog())
+        self.assertEqual(wrappers.channel_index('Peak/Valley'), 1)
+        wrappers.close_data_file()
+        wrappers.open_data_file(DATAFILE1)
+
     def test_get_scaled_samples_count(self):
         # self.assertEqual(wrappers.get_scaled_samples_count(1), 0)
         chlist = wrappers.get_channel_list()
@@ -283,6 +384,175 @@ class TestWrappersExampleFile01(unittest.TestCase):
                 time, data = wrappers.get_scaled_samples(ch.index, 0, count)
                 self.assertEqual((time[:5], time[-5:]), headtails[ch.index])
 
+    def test_iter_scaled_samples(self):
+        count = wrappers.get_scaled_samples_count(14)
+        time, data = wrappers.get_scaled_samples(14, 0, count)
+        chunks = list(wrappers.iter_scaled_samples(14, chunk=100))
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(tuple(t for c in chunks for t in c[0]), time)
+        self.assertEqual(tuple(d for c in chunks for d in c[1]), data)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_iter_scaled_samples_as_array(self):
+        count = wrappers.get_scaled_samples_count(0)
+        time, data = wrappers.get_scaled_samples(0, 0, count, as_array=True)
+        position = 0
+        for ctime, cdata in wrappers.iter_scaled_samples(0, chunk=1000,
+                                                         as_array=True):
+            self.assertTrue(len(ctime) <= 1000)
+            n = len(ctime)
+            self.assertTrue((ctime == time[position:position + n]).all())
+            self.assertTrue((cdata == data[position:position + n]).all())
+            position += n
+        self.assertEqual(position, count)
+
+    def test_get_raw_samples_count(self):
+        self.assertEqual(wrappers.get_raw_samples_count(0),
+                         DATAFILE1COUNTS[0].scaled)
+
+    def test_get_raw_samples(self):
+        # GPSvel is dtSmallInt (16-bit) with a scale factor
+        count = wrappers.get_scaled_samples_count(0)
+        time, data = wrappers.get_scaled_samples(0, 0, count)
+        raw = wrappers.get_raw_samples(0, 0, count)
+        self.assertEqual(raw.time_stamp, time)
+        self.assertEqual((raw.scale, raw.offset),
+                         wrappers.get_channel_factors(0))
+        self.assertIsInstance(raw.data[0], int)
+        self.assertEqual(raw.scaled(), data)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_raw_samples_as_array(self):
+        count = wrappers.get_scaled_samples_count(27)
+        time, data = wrappers.get_scaled_samples(27, 0, count, as_array=True)
+        raw = wrappers.get_raw_samples(27, 0, count, data_type=4,
+                                       as_array=True)
+        self.assertEqual(raw.data.dtype, np.int32)
+        self.assertTrue((raw.time_stamp == time).all())
+        self.assertTrue(np.allclose(raw.scaled(), data))
+
+    def test_get_raw_samples_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            wrappers.get_raw_samples(0, 0, 1, data_type=13)
+
+    def test_window_positions(self):
+        for index in (0, 3, 14, 22, 27):
+            count = wrappers.get_scaled_samples_count(index)
+            time, _ = wrappers.get_scaled_samples(index, 0, count)
+            for t0, t1 in ((10, 12), (-5, 0.5), (95, 200), (33.3, 33.4),
+                           (50, 50)):
+                inside = [i for i, t in enumerate(time) if t0 <= t < t1]
+                position, count = wrappers.window_positions(index, t0, t1)
+                self.assertEqual(list(range(position, position + count)),
+                                 inside)
+
+    def test_window_positions_channel_rate(self):
+        # TEMP_OUTSIDE taken as a sync channel, 5 Hz in a 100 Hz file
+        get_channel_props = wrappers.get_channel_props
+
+        def sync(index, ch_prop, encoding=None):
+            if ch_prop == wrappers.dh.DWChannelProps.DW_CH_TYPE.value:
+                return wrappers.dh.DWChannelType.DW_CH_TYPE_SYNC.value
+            return get_channel_props(index, ch_prop, encoding)
+
+        time, _ = wrappers.read_window(14, 30, 40)
+        wrappers._file_state.pop('time_probes', None)
+        with mock.patch.object(wrappers, 'get_channel_props', sync):
+            position, count = wrappers.window_positions(14, 30, 40)
+        self.assertEqual(count, len(time))
+        self.assertEqual(wrappers.get_scaled_samples(14, position, 1)[0][0],
+                         time[0])
+        # first and last for the rate, then two each window border
+        self.assertLessEqual(len(wrappers._file_state['time_probes'][14]), 6)
+
+    def test_read_window(self):
+        time, data = wrappers.read_window('GPSvel', 10, 12)
+        self.assertEqual(len(time), 200)
+        self.assertEqual(time[0], 10.0)
+        self.assertEqual((time, data),
+                         wrappers.get_scaled_samples(0, 1000, 200))
+
+    def test_read_window_async(self):
+        time, data = wrappers.read_window('TEMP_OUTSIDE', 30, 40)
+        self.assertTrue(all(30 <= t < 40 for t in time))
+        self.assertEqual(len(time), 50)
+
+    def test_get_binary_samples_not_binary(self):
+        # no binary channels in the test files
+        with self.assertRaises(RuntimeError):
+            wrappers.get_binary_samples(0, 0, 10)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_scaled_samples_as_array(self):
+        count = wrappers.get_scaled_samples_count(3)
+        time, data = wrappers.get_scaled_samples(3, 0, count)
+        atime, adata = wrappers.get_scaled_samples(3, 0, count, as_array=True)
+        self.assertIsInstance(atime, np.ndarray)
+        self.assertEqual(adata.shape, (count,))
+        self.assertEqual(tuple(atime.tolist()), time)
+        self.assertEqual(tuple(adata.tolist()), data)
+
+    def test_get_scaled_samples_out(self):
+        time, data = wrappers.get_scaled_samples(0, 100, 50)
+        out = array.array('d', bytes(8 * 60))
+        time_out = bytearray(8 * 50)
+        rtime, rdata = wrappers.get_scaled_samples(0, 100, 50, out=out,
+                                                   time_out=time_out)
+        self.assertIs(rdata, out)
+        self.assertIs(rtime, time_out)
+        self.assertEqual(tuple(out[:50]), data)
+        self.assertEqual(struct.unpack('50d', time_out), time)
+        # only one buffer given
+        rtime, rdata = wrappers.get_scaled_samples(0, 100, 50, out=out)
+        self.assertEqual(rtime, time)
+
+    def test_get_scaled_samples_out_invalid(self):
+        with self.assertRaises(ValueError):
+            wrappers.get_scaled_samples(0, 0, 50, out=array.array('d', [0]))
+        with self.assertRaises(ValueError):
+            wrappers.get_scaled_samples(0, 0, 5, out=array.array('i', [0]*10))
+        with self.assertRaises(ValueError):
+            wrappers.get_scaled_samples(0, 0, 5, time_out=bytes(40))
+        with self.assertRaises(TypeError):
+            wrappers.get_scaled_samples(0, 0, 5, out=[0.0] * 5)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_scaled_samples_out_array(self):
+        time, data = wrappers.get_scaled_samples(0, 0, 100, as_array=True)
+        out, time_out = np.zeros(100), np.zeros(100)
+        for position in (0, 50):
+            wrappers.get_scaled_samples(0, position, 50, out=out,
+                                        time_out=time_out)
+            self.assertEqual(out[:50].tolist(),
+                             data[position:position + 50].tolist())
+            self.assertEqual(time_out[:50].tolist(),
+                             time[position:position + 50].tolist())
+        with self.assertRaises(ValueError):
+            wrappers.get_scaled_samples(0, 0, 10, out=np.zeros(40)[::2])
+        with self.assertRaises(ValueError):
+            wrappers.get_scaled_samples(0, 0, 10, out=np.zeros(10, 'f4'))
+
+    def test_get_reduced_values_out(self):
+        records = wrappers.get_reduced_values(0, 10, 20)
+        out = array.array('d', bytes(8 * 5 * 20))
+        self.assertIs(wrappers.get_reduced_values(0, 10, 20, out=out), out)
+        self.assertEqual([tuple(out[i:i + 5]) for i in range(0, 100, 5)],
+                         records)
+        with self.assertRaises(ValueError):
+            wrappers.get_reduced_values(0, 10, 21, out=out)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_get_reduced_values_out_array(self):
+        out = np.zeros(20, wrappers.REDUCED_DTYPE)
+        wrappers.get_reduced_values(0, 10, 20, out=out)
+        self.assertEqual([tuple(rec) for rec in out.tolist()],
+                         wrappers.get_reduced_values(0, 10, 20))
+
+    def test_get_channel_factors_out(self):
+        out = array.array('d', [0.0, 0.0])
+        self.assertIs(wrappers.get_channel_factors(0, out=out), out)
+        self.assertEqual(tuple(out), wrappers.get_channel_factors(0))
+
     def test_channel_reduced_time_stamps_by_index(self):
         #      0        1    2    3    4
         # (time_stamp, ave, min, max, rms)
@@ -342,5 +612,125 @@ class TestWrappersExampleFile01(unittest.TestCase):
             print('error: de_init() returned', result)
 
 
+class TestChannelCatalog(unittest.TestCase):
+
+    def test_repeated_names(self):
+        # the first channel of a name wins, as in channel list order
+        channels = [wrappers.Channel(index, name, '', '', 0, 1, 5)
+                    for index, name in ((4, 'a'), (2, 'b'), (7, 'a'))]
+        catalog = wrappers.ChannelCatalog(channels,
+                                          {4: 'x', 2: 'y', 7: 'y'})
+        self.assertEqual(catalog.index('a'), 4)
+        self.assertEqual(catalog.index('y'), 2)
+
+
+class TestParseBinaryRecords(unittest.TestCase):
+    """Test parsing of DWGetBinarySamplesEx records without the lib."""
+
+    fixed = b''.join(struct.pack('i', 3) + bytes([n] * 3) for n in range(5))
+    variable = (struct.pack('i', 2) + b'ab' + struct.pack('i', 0)
+                + struct.pack('i', 3) + b'cde' + bytes(20))
+
+    def test_fixed_length(self):
+        offsets, data = wrappers.parse_binary_records(self.fixed, 5)
+        self.assertEqual(offsets, (0, 3, 6, 9, 12, 15))
+        self.assertEqual(data[3:6], bytes([1] * 3))
+
+    def test_variable_length(self):
+        offsets, data = wrappers.parse_binary_records(self.variable, 3)
+        self.assertEqual(offsets, (0, 2, 2, 5))
+        self.assertEqual(data, b'abcde')
+
+    def test_exceeding_buffer(self):
+        with self.assertRaises(ValueError):
+            wrappers.parse_binary_records(struct.pack('i', 50) + b'x', 1)
+
+    def test_truncated_or_corrupt(self):
+        negative = struct.pack('i', -4) + bytes(8)
+        for as_array in (False, True)[:1 if np is None else 2]:
+            with self.assertRaises(ValueError):
+                wrappers.parse_binary_records(self.fixed, 1, as_array, 0)
+            with self.assertRaises(ValueError):
+                wrappers.parse_binary_records(negative, 3, as_array)
+
+    def test_bounded_by_nbytes(self):
+        # the padding after the records is not parsed
+        offsets, data = wrappers.parse_binary_records(self.variable, 3,
+                                                      nbytes=17)
+        self.assertEqual(offsets, (0, 2, 2, 5))
+        for as_array in (False, True)[:1 if np is None else 2]:
+            with self.assertRaises(ValueError):
+                wrappers.parse_binary_records(self.fixed, 5, as_array, 30)
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_as_array(self):
+        for buffer, count in ((self.fixed, 5), (self.variable, 3)):
+            offsets, data = wrappers.parse_binary_records(buffer, count,
+                                                          as_array=True)
+            self.assertEqual((tuple(offsets.tolist()), data.tobytes()),
+                             wrappers.parse_binary_records(buffer, count))
+
+
+# seconds allowed for importing the wrappers module, numpy alone takes
+# longer to import and so does loading the library on slow machines
+IMPORT_TIME_BUDGET = 0.1
+
+
+def run_python(code):
+    """Run code in a new python process and return its stdout."""
+    return subprocess.run([sys.executable, '-c', code], cwd=packdir,
+                          check=True, stdout=subprocess.PIPE,
+                          universal_newlines=True).stdout
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_import_time(self):
+        seconds, loaded = [], None
+        for _ in range(3):
+            out = run_python(
+                'import sys, time\n'
+                't = time.perf_counter()\n'
+                'import dwdat2py.wrappers\n'
+                'print(time.perf_counter() - t)\n'
+                'print("numpy" in sys.modules,'
+                ' dwdat2py.wrappers.libname is not None)\n')
+            first, loaded = out.splitlines()
+            seconds.append(float(first))
+        self.assertEqual(loaded, 'False False')
+        self.assertLess(min(seconds), IMPORT_TIME_BUDGET)
+
+    def test_load_on_first_call(self):
+        out = run_python(
+            'import threading\n'
+            'from dwdat2py import wrappers\n'
+            'libs = []\n'
+            'threads = [threading.Thread(target=lambda: libs.append('
+            'wrappers.load_library())) for _ in range(4)]\n'
+            '[t.start() for t in threads]\n'
+            '[t.join() for t in threads]\n'
+            'print(len(set(map(id, libs))), wrappers.init(),'
+            ' wrappers.de_init())\n')
+        self.assertEqual(out.split(), ['1', '0', '0'])
+
+    def test_dewelibdir_after_import(self):
+        out = run_python(
+            'import dwdat2py\n'
+            'from dwdat2py import wrappers\n'
+            'dwdat2py.DEWELIBDIR = "no such dir"\n'
+            'try:\n'
+            '    wrappers.init()\n'
+            'except FileNotFoundError:\n'
+            '    print("not found")\n')
+        self.assertEqual(out.strip(), 'not found')
+
+    @unittest.skipIf(np is None, 'numpy not available')
+    def test_reduced_dtype(self):
+        out = run_python(
+            'from dwdat2py import wrappers\n'
+            'print(wrappers.REDUCED_DTYPE.names)\n')
+        self.assertEqual(out.strip(), str(wrappers.REDUCED_DTYPE.names))
+
+
 if __name__ == '__main__':
     unittest.main()